@@ -1,9 +1,10 @@
 import os
-import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
-from excel_writer import write_excel_file
+from excel_writer import write_excel_file, write_excel_file_xlsxwriter, EXCEL_ENGINE, XLSXWRITER_AVAILABLE
 from highlight_requirements import highlight_requirements
 from pdf_analyzer import requirement_finder
 from basil_integration import export_to_basil
@@ -32,8 +33,47 @@ except ImportError:
     ProcessingStatus = None
     DATABASE_AVAILABLE = False
 
+# Priority text (as produced by requirement_finder) to database enum
+if DATABASE_AVAILABLE:
+    _PRIORITY_MAP = {
+        'high': Priority.HIGH,
+        'medium': Priority.MEDIUM,
+        'low': Priority.LOW,
+        'security': Priority.SECURITY
+    }
+else:
+    _PRIORITY_MAP = {}
+
 logger = logging.getLogger(__name__)
 
+# Compliance matrix template bytes keyed by path -> (mtime_ns, size, bytes).
+# A batch run reads the template from disk once instead of copying it per PDF.
+_TEMPLATE_CACHE = {}
+
+
+def load_cm_template(cm_path):
+    """
+    Return the raw bytes of a compliance matrix template, cached per file version.
+
+    The cache entry is refreshed whenever the template's modification time or
+    size changes, so edits to the template are picked up on the next run.
+
+    Args:
+        cm_path: Path to the (already validated) compliance matrix template
+
+    Returns:
+        bytes: Content of the template file
+    """
+    stat_result = os.stat(cm_path)
+    cached = _TEMPLATE_CACHE.get(cm_path)
+    if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+
+    with open(cm_path, 'rb') as f:
+        template_bytes = f.read()
+    _TEMPLATE_CACHE[cm_path] = (stat_result.st_mtime_ns, stat_result.st_size, template_bytes)
+    return template_bytes
+
 
 def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_threshold=0.5, project=None):
     """
@@ -84,94 +124,248 @@ def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_thresh
         raise
 
     # ========================= FILE NAME PREPARATION ========================================================
-    # Get current date for file naming
-    current_date = datetime.today()
-    formatted_date = current_date.strftime('%Y.%m.%d')
-
     filename_path, ext = os.path.splitext(str(validated_pdf))
     filename = os.path.basename(filename_path)
 
+    # Without a project there is nothing to persist: run the plain pipeline with no database branches
+    if project is None or not DATABASE_AVAILABLE:
+        return _run_pipeline(validated_pdf, validated_cm, validated_output, words_to_find, filename,
+                             confidence_threshold)
+
     # ========================= DATABASE OPERATIONS (v3.0) ==================================================
     # v3.0: Create or get document in database
-    document = None
-    if project and DATABASE_AVAILABLE and DocumentService:
+    document = _get_or_create_document(project, validated_pdf)
+
+    # v3.0: Save requirements to database as soon as they are extracted
+    on_extracted = partial(_save_requirements, project=project, document=document) if document else None
+    return _run_pipeline(validated_pdf, validated_cm, validated_output, words_to_find, filename,
+                         confidence_threshold, on_extracted=on_extracted)
+
+
+def sync_documents(project, paths):
+    """
+    Get or create the database documents for a batch of PDFs at once.
+
+    Resolves the whole batch with a single DocumentService.sync_folder call
+    instead of one lookup per PDF; the results can be handed to
+    persist_requirements.
+
+    Args:
+        project: Project object the documents belong to
+        paths: Paths to the input PDFs
+
+    Returns:
+        dict: Input path -> Document, for every PDF that passed validation and was synced
+    """
+    if project is None or not DATABASE_AVAILABLE:
+        return {}
+
+    validated = {}
+    for path_in in paths:
         try:
-            document, is_new = DocumentService.get_or_create_document(
-                project_id=project.id,
-                filename=os.path.basename(str(validated_pdf)),
-                file_path=str(validated_pdf)
-            )
-            if document:
-                if is_new:
-                    logger.info(f"Created new document in database: {document.filename} (ID: {document.id})")
-                else:
-                    logger.info(f"Retrieved existing document from database: {document.filename} (ID: {document.id})")
-        except Exception as e:
-            logger.error(f"Failed to create/retrieve document in database: {str(e)}")
-            # Continue processing even if database save fails
+            validated[path_in] = str(validate_pdf_input(path_in))
+        except PathValidationError as e:
+            logger.error(f"PDF input validation failed: {str(e)}")
+
+    try:
+        synced = DocumentService.sync_folder(
+            project_id=project.id,
+            files=[(_document_name(project, pdf), pdf) for pdf in validated.values()]
+        )
+    except Exception as e:
+        logger.error(f"Failed to sync documents in database: {str(e)}")
+        return {}
+
+    documents = {}
+    for path_in, pdf in validated.items():
+        document, _ = synced.get(_document_name(project, pdf), (None, False))
+        if document:
+            documents[path_in] = document
+    return documents
+
+
+def persist_requirements(df, project, path_in, document=None):
+    """
+    Save requirements extracted by a database-less requirement_bot run.
+
+    Used when the pipeline ran in another process, where the project's database
+    session is not available: the document is looked up (or created) and the
+    requirements saved from the calling process instead.
+
+    Args:
+        df: DataFrame returned by requirement_bot
+        project: Project object the document belongs to
+        path_in: Path to the input PDF the requirements were extracted from
+        document: Document already resolved by sync_documents (optional)
+    """
+    if project is None or not DATABASE_AVAILABLE:
+        return
+
+    try:
+        validated_pdf = validate_pdf_input(path_in)
+    except PathValidationError as e:
+        logger.error(f"PDF input validation failed: {str(e)}")
+        return
+
+    if document is None:
+        document = _get_or_create_document(project, validated_pdf)
+    if document:
+        _save_requirements(df, project=project, document=document)
+
+
+def _run_pipeline(validated_pdf, validated_cm, validated_output, words_to_find, filename,
+                  confidence_threshold, on_extracted=None):
+    """
+    Extract requirements from a validated PDF and write all outputs.
 
+    Args:
+        validated_pdf: Validated input PDF path
+        validated_cm: Validated compliance matrix template path
+        validated_output: Validated output directory
+        words_to_find: Set of keywords to find
+        filename: Input file name without extension, used for output naming
+        confidence_threshold: Minimum confidence threshold for requirements
+        on_extracted: Optional callable invoked with the extracted DataFrame before
+                      the outputs are written (used for database persistence)
+
+    Returns:
+        DataFrame with extracted requirements
+    """
     # ========================= REQUIREMENT EXTRACTION =======================================================
     df = requirement_finder(str(validated_pdf), words_to_find, filename, confidence_threshold)
 
-    # ========================= DATABASE SAVE (v3.0) ========================================================
-    # v3.0: Save requirements to database
-    if project and document and len(df) > 0 and DATABASE_AVAILABLE and RequirementService:
+    if on_extracted is not None:
+        on_extracted(df)
+
+    # ========================= OUTPUT GENERATION ==========================================================
+    # All outputs share the '<output dir>/YYYY.MM.DD' prefix; build it once
+    output_prefix = os.path.join(str(validated_output), datetime.today().strftime('%Y.%m.%d'))
+    cm_ext = os.path.splitext(str(validated_cm))[1]
+    new_cm_path = f"{output_prefix}_Compliance Matrix_{filename}{cm_ext}"
+    basil_output_path = f"{output_prefix}_BASIL_Export_{filename}.jsonld"
+    out_pdf_path = f"{output_prefix}_Tagged_{filename}.pdf"
+
+    # The three outputs only depend on df, so they are written concurrently.
+    # BASIL and PDF failures are logged inside their stage; a compliance matrix
+    # failure is re-raised once all stages have finished.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        cm_future = executor.submit(_write_compliance_matrix, df, validated_cm, new_cm_path)
+        executor.submit(_export_basil, df, basil_output_path, filename)
+        executor.submit(_annotate_pdf, df, validated_pdf, out_pdf_path, filename)
+    cm_future.result()
+
+    # ====================================================================================================
+    logger.info(f"Processing completed successfully for {filename}")
+    return df
+
+
+def _document_name(project, pdf_path):
+    """
+    Name identifying a PDF's document within its project.
+
+    PDFs are found recursively, so the name is the path relative to the project's
+    input folder: equally named PDFs in different subfolders stay separate
+    documents. PDFs directly in the input folder, or outside it, use their file name.
+    """
+    pdf = os.path.realpath(str(pdf_path))
+    input_folder = getattr(project, 'input_folder_path', None)
+    if input_folder:
         try:
-            logger.info(f"Saving {len(df)} requirements to database...")
-            saved_count = 0
-            for _, row in df.iterrows():
-                # Map priority text to enum
-                priority_map = {
-                    'high': Priority.HIGH,
-                    'medium': Priority.MEDIUM,
-                    'low': Priority.LOW,
-                    'security': Priority.SECURITY
-                }
-                priority_enum = priority_map.get(row.get('Priority', '').lower(), Priority.MEDIUM)
-
-                # Create requirement
-                req = RequirementService.create_requirement(
-                    document_id=document.id,
-                    project_id=project.id,
-                    label_number=row['Label Number'],
-                    description=row['Description'],
-                    page_number=int(row['Page']),
-                    keyword=row.get('Keyword'),
-                    priority=priority_enum,
-                    confidence_score=float(row.get('Confidence', 0.0)),
-                    raw_text=str(row.get('Raw', ''))
-                )
-                if req:
-                    saved_count += 1
-
-            logger.info(f"Successfully saved {saved_count}/{len(df)} requirements to database")
-
-            # Update document status to completed
-            if DocumentService and ProcessingStatus:
-                DocumentService.update_processing_status(
-                    document_id=document.id,
-                    status=ProcessingStatus.COMPLETED,
-                    page_count=int(df['Page'].max()) if 'Page' in df.columns else None
-                )
-        except Exception as e:
-            logger.error(f"Failed to save requirements to database: {str(e)}")
-            # Continue processing even if database save fails
-
-    # ========================= COMPLIANCE MATRIX GENERATION =================================================
-    cm_with_extension = os.path.basename(str(validated_cm))
-    cm_filename, cm_ext = os.path.splitext(cm_with_extension)
-    new_cm_path = os.path.join(str(validated_output), formatted_date + '_Compliance Matrix_' + filename + cm_ext)
+            relative = os.path.relpath(pdf, os.path.realpath(input_folder))
+        except ValueError:  # Different drives on Windows
+            relative = os.pardir
+        if relative != os.pardir and not relative.startswith(os.pardir + os.sep):
+            return relative.replace(os.sep, '/')
+    return os.path.basename(pdf)
 
+
+def _get_or_create_document(project, validated_pdf):
+    """Return the database document for the PDF, or None if it cannot be created/retrieved."""
+    if not DocumentService:
+        return None
+
+    try:
+        document, is_new = DocumentService.get_or_create_document(
+            project_id=project.id,
+            filename=_document_name(project, validated_pdf),
+            file_path=str(validated_pdf)
+        )
+        if document:
+            if is_new:
+                logger.info(f"Created new document in database: {document.filename} (ID: {document.id})")
+            else:
+                logger.info(f"Retrieved existing document from database: {document.filename} (ID: {document.id})")
+        return document
+    except Exception as e:
+        logger.error(f"Failed to create/retrieve document in database: {str(e)}")
+        # Continue processing even if database save fails
+        return None
+
+
+def _save_requirements(df, project, document):
+    """Save extracted requirements to the database and mark the document completed."""
+    n_requirements = len(df)
+    if n_requirements == 0 or not RequirementService:
+        return
+
+    try:
+        logger.info(f"Saving {n_requirements} requirements to database...")
+        # Map priority text to enum for the whole column at once (unknown/missing -> MEDIUM)
+        if 'Priority' in df.columns:
+            priorities = df['Priority'].fillna('').astype(str).str.lower().map(_PRIORITY_MAP)
+            priorities = priorities.fillna(Priority.MEDIUM).tolist()
+        else:
+            priorities = [Priority.MEDIUM] * n_requirements
+
+        # Insert all requirements in one transaction instead of one commit per row
+        requirements_data = [
+            {
+                'document_id': document.id,
+                'project_id': project.id,
+                'label_number': row['Label Number'],
+                'description': row['Description'],
+                'page_number': int(row['Page']),
+                'keyword': row.get('Keyword'),
+                'priority': priority,
+                'confidence_score': float(row.get('Confidence', 0.0)),
+                'raw_text': str(row.get('Raw', ''))
+            }
+            for row, priority in zip(df.to_dict('records'), priorities)
+        ]
+        # Re-processing a document replaces its current requirements
+        saved_count = RequirementService.bulk_create(requirements_data, replace_current=True)
+
+        logger.info(f"Successfully saved {saved_count}/{n_requirements} requirements to database")
+
+        # Update document status to completed
+        if DocumentService and ProcessingStatus:
+            DocumentService.update_processing_status(
+                document_id=document.id,
+                status=ProcessingStatus.COMPLETED,
+                page_count=int(df['Page'].to_numpy().max()) if 'Page' in df.columns else None
+            )
+    except Exception as e:
+        logger.error(f"Failed to save requirements to database: {str(e)}")
+        # Continue processing even if database save fails
+
+
+def _write_compliance_matrix(df, validated_cm, new_cm_path):
+    """Write the compliance matrix for df; errors are logged and re-raised."""
     # Validate output path before writing (Security Fix)
     try:
         validated_cm_output = validate_output_path(
             new_cm_path,
             allowed_extensions=['.xlsx', '.XLSX']
         )
-        shutil.copy2(str(validated_cm), str(validated_cm_output))
-        logger.info(f"Copied CM template to: {sanitize_path_for_logging(str(validated_cm_output))}")
-
-        write_excel_file(df=df, excel_file=str(validated_cm_output))
+        # Build the matrix from the cached template bytes; the only disk write is the final save
+        template_bytes = load_cm_template(str(validated_cm))
+        if EXCEL_ENGINE == 'xlsxwriter' and XLSXWRITER_AVAILABLE:
+            write_excel_file_xlsxwriter(df=df, excel_file=str(validated_cm_output), template_bytes=template_bytes)
+        else:
+            if EXCEL_ENGINE == 'xlsxwriter':
+                logger.warning("xlsxwriter is not installed, falling back to the openpyxl Excel engine")
+            write_excel_file(df=df, excel_file=str(validated_cm_output), template_bytes=template_bytes)
+        logger.info(f"Compliance matrix written to: {sanitize_path_for_logging(str(validated_cm_output))}")
         logger.info("Excel compliance matrix generated successfully")
 
     except PathValidationError as e:
@@ -181,9 +375,9 @@ def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_thresh
         logger.error(f"Failed to generate compliance matrix: {str(e)}")
         raise
 
-    # ========================= BASIL SPDX 3.0.1 EXPORT ======================================================
-    basil_output_path = os.path.join(str(validated_output), formatted_date + '_BASIL_Export_' + filename + '.jsonld')
 
+def _export_basil(df, basil_output_path, filename):
+    """Write the BASIL SPDX 3.0.1 export for df; errors are logged, not raised."""
     # Validate BASIL output path (Security Fix)
     try:
         validated_basil = validate_output_path(
@@ -209,9 +403,9 @@ def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_thresh
         logger.error(f"Error during BASIL export for {filename}: {str(e)}")
         # Continue processing even if BASIL export fails
 
-    # ========================= PDF ANNOTATION ===============================================================
-    out_pdf_path = os.path.join(str(validated_output), formatted_date + "_Tagged_" + filename + '.pdf')
 
+def _annotate_pdf(df, validated_pdf, out_pdf_path, filename):
+    """Write the highlighted copy of the input PDF; errors are logged, not raised."""
     # Validate PDF output path before annotation (Security Fix)
     try:
         validated_pdf_output = validate_output_path(
@@ -221,9 +415,9 @@ def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_thresh
 
         highlight_requirements(
             filepath=str(validated_pdf),
-            requirements_list=list(df['Raw']),
-            note_list=list(df['Note']),
-            page_list=list(df['Page']),
+            requirements_list=df['Raw'].tolist(),
+            note_list=df['Note'].tolist(),
+            page_list=df['Page'].tolist(),
             out_pdf_name=str(validated_pdf_output)
         )
         logger.info(f"Annotated PDF created: {sanitize_path_for_logging(str(validated_pdf_output))}")
@@ -234,7 +428,3 @@ def requirement_bot(path_in, cm_path, words_to_find, path_out, confidence_thresh
     except Exception as e:
         logger.error(f"Error during PDF annotation for {filename}: {str(e)}")
         # Continue - don't fail entire process if annotation fails
-
-    # ====================================================================================================
-    logger.info(f"Processing completed successfully for {filename}")
-    return df
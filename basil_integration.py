@@ -16,12 +16,32 @@ Date: 2025-11-17
 import json
 import hashlib
 import logging
+import math
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, Tuple
 import pandas as pd
 
+# Optional: ijson streams the elements of large BASIL documents instead of loading them whole
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+# Optional: orjson serializes the annotation statements several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Stdlib decoder reused for every annotation statement when orjson is not installed
+_JSON_DECODER = json.JSONDecoder()
+
 
 # BASIL Integration Constants
 BASIL_TYPE_FILE = "software_File"
@@ -57,13 +77,16 @@ def calculate_md5_hash(text: str) -> str:
     """
     Calculate MD5 hash of a text string.
 
+    The hash is an integrity marker for BASIL, not a security feature, so
+    OpenSSL is allowed to use its non-FIPS MD5 implementation.
+
     Args:
         text: Input text to hash
 
     Returns:
         MD5 hash as hexadecimal string
     """
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+    return hashlib.md5(text.encode('utf-8'), usedforsecurity=False).hexdigest()
 
 
 def extract_requirement_id(label_number: str) -> int:
@@ -92,6 +115,24 @@ def extract_requirement_id(label_number: str) -> int:
         return 0
 
 
+def extract_requirement_ids(labels: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_requirement_id for a whole column of label numbers.
+
+    Uses a single regex pass instead of splitting every label in Python.
+
+    Args:
+        labels: Series of ReqBot label number strings
+
+    Returns:
+        Series of integer IDs (0 where extraction fails), aligned with labels
+    """
+    # Text between the first "-Req#" and the next hyphen, as extract_requirement_id reads it
+    id_text = labels.astype('string').str.extract(r'-Req#([^-]*)', expand=False).str.strip()
+    is_number = id_text.str.fullmatch(r'[0-9]{1,18}').fillna(False).astype(bool)
+    return id_text.where(is_number, '0').astype('int64')
+
+
 def create_basil_requirement(req_id: int, title: str, description: str,
                              priority: str = "low", page: int = 1,
                              keyword: str = "", confidence: float = 0.0,
@@ -120,7 +161,73 @@ def create_basil_requirement(req_id: int, title: str, description: str,
     status = STATUS_MAPPING.get(priority.lower(), "NEW")
 
     # Create the statement JSON with all requirement metadata
-    statement_data = {
+    statement_json = _statement_json(req_id, title, description, status, priority, page, keyword,
+                                     confidence, created_by, version, timestamp)
+
+    # Calculate hash for verification
+    hash_value = calculate_md5_hash(description)
+
+    return _basil_elements(str(req_id), title, description, hash_value, statement_json)
+
+
+def _finite_or_none(value: Any) -> Any:
+    """Replace NaN and Infinity floats, which are not valid JSON, with None (recursively)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite_or_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_or_none(item) for item in value]
+    return value
+
+
+def _dumps_bytes(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize a dictionary to compact UTF-8 JSON.
+
+    Uses orjson when installed; the stdlib fallback produces the same output
+    (compact separators, non-ASCII characters kept as-is, NaN and Infinity
+    written as null).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson.JSONEncodeError: e.g. numpy scalars, let json handle/report it
+            pass
+    try:
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        # NaN/Infinity somewhere in the data: write null like orjson does
+        text = json.dumps(_finite_or_none(data), separators=(',', ':'), ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize an annotation statement to compact JSON (see _dumps_bytes)."""
+    return _dumps_bytes(data).decode('utf-8')
+
+
+def _loads(statement: str) -> Any:
+    """
+    Parse an annotation statement (orjson when installed, else the shared stdlib decoder).
+
+    Raises json.JSONDecodeError on malformed input.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(statement)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity written by json.dumps, which only the stdlib accepts
+            pass
+    return _JSON_DECODER.decode(statement)
+
+
+def _statement_json(req_id: int, title: str, description: str, status: str, priority: str,
+                    page: int, keyword: str, confidence: float, created_by: str,
+                    version: str, timestamp: str) -> str:
+    """Return the stringified BASIL statement carried by a requirement's Annotation."""
+    return _dumps({
         "id": req_id,
         "title": title,
         "description": description,
@@ -137,17 +244,20 @@ def create_basil_requirement(req_id: int, title: str, description: str,
             "confidence": confidence,
             "priority": priority
         }
-    }
+    })
 
-    statement_json = json.dumps(statement_data)
 
-    # Calculate hash for verification
-    hash_value = calculate_md5_hash(description)
+def _basil_elements(req_id_text: str, title: str, description: str, hash_value: str,
+                    statement_json: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Return the (file_element, annotation_element) pair for one requirement.
 
+    req_id_text is the requirement ID already converted to str, so the four
+    IDs derived from it are plain concatenations.
+    """
     # Create SPDX IDs
-    spdx_id = f"{BASIL_NAMESPACE_PREFIX}{req_id}"
-    annotation_id = f"{BASIL_ANNOTATION_PREFIX}{req_id}"
-    creation_info_id = f"{BASIL_CREATION_INFO_PREFIX}{req_id}"
+    spdx_id = BASIL_NAMESPACE_PREFIX + req_id_text
+    creation_info_id = BASIL_CREATION_INFO_PREFIX + req_id_text
 
     # Create File element (BASIL Software Requirement)
     file_element = {
@@ -156,7 +266,7 @@ def create_basil_requirement(req_id: int, title: str, description: str,
         "software_copyrightText": "",
         "software_primaryPurpose": BASIL_PURPOSE_REQUIREMENT,
         "name": title,
-        "comment": f"BASIL Software Requirement ID {req_id}",
+        "comment": "BASIL Software Requirement ID " + req_id_text,
         "description": description,
         "verifiedUsing": [
             {
@@ -172,7 +282,7 @@ def create_basil_requirement(req_id: int, title: str, description: str,
     annotation_element = {
         "type": BASIL_ANNOTATION_TYPE,
         "annotationType": BASIL_ANNOTATION_OTHER,
-        "spdxId": annotation_id,
+        "spdxId": BASIL_ANNOTATION_PREFIX + req_id_text,
         "subject": spdx_id,
         "statement": statement_json,
         "creationInfo": creation_info_id
@@ -181,6 +291,23 @@ def create_basil_requirement(req_id: int, title: str, description: str,
     return file_element, annotation_element
 
 
+def _column_values(df: pd.DataFrame, column: str, default: Any) -> list:
+    """
+    Return a DataFrame column as a list of Python scalars.
+
+    Args:
+        df: Source DataFrame
+        column: Column name
+        default: Value used for every row if the column is missing
+
+    Returns:
+        List with one value per row
+    """
+    if column in df.columns:
+        return df[column].tolist()
+    return [default] * len(df)
+
+
 def export_to_basil(df: pd.DataFrame, output_path: str,
                     created_by: str = "ReqBot",
                     document_name: str = "ReqBot Requirements Export") -> bool:
@@ -215,43 +342,55 @@ def export_to_basil(df: pd.DataFrame, output_path: str,
                 "created": datetime.now().isoformat(),
                 "createdBy": [created_by],
                 "specVersion": "3.0.1"
-            },
-            "element": []
+            }
         }
 
-        # Process each requirement
-        for index, row in df.iterrows():
-            # Extract requirement ID from label
-            req_id = extract_requirement_id(row.get('Label Number', ''))
-            if req_id == 0:
-                req_id = index + 1  # Fallback to index-based ID
-
-            title = row.get('Note', row.get('Description', ''))[:100]  # First 100 chars as title
-            description = row.get('Description', '')
-            priority = row.get('Priority', 'low')
-            page = row.get('Page', 1)
-            keyword = row.get('Keyword', '')
-            confidence = row.get('Confidence', 0.0)
-
-            # Create BASIL elements
-            file_elem, annotation_elem = create_basil_requirement(
-                req_id=req_id,
-                title=title,
-                description=description,
-                priority=priority,
-                page=page,
-                keyword=keyword,
-                confidence=confidence,
-                created_by=created_by
-            )
-
-            # Add to document
-            spdx_document["element"].append(file_elem)
-            spdx_document["element"].append(annotation_elem)
-
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(spdx_document, f, indent=2, ensure_ascii=False)
+        # Read each column once as a list of Python scalars instead of boxing every row
+        # into a Series with iterrows(); missing optional columns fall back to defaults
+        descriptions = _column_values(df, 'Description', '')
+        notes = df['Note'].tolist() if 'Note' in df.columns else descriptions
+        priorities = _column_values(df, 'Priority', 'low')
+        pages = _column_values(df, 'Page', 1)
+        keywords = _column_values(df, 'Keyword', '')
+        confidences = _column_values(df, 'Confidence', 0.0)
+
+        # Requirement IDs from the labels, falling back to the index-based ID
+        if 'Label Number' in df.columns:
+            label_ids = extract_requirement_ids(df['Label Number']).tolist()
+        else:
+            label_ids = [0] * len(df)
+        req_ids = [req_id or index + 1 for req_id, index in zip(label_ids, df.index)]
+        titles = [note[:100] for note in notes]  # First 100 chars as title
+
+        # Map ReqBot priorities to BASIL statuses for the whole column at once
+        if 'Priority' in df.columns:
+            statuses = df['Priority'].astype(str).str.lower().map(STATUS_MAPPING).fillna("NEW").tolist()
+        else:
+            statuses = [STATUS_MAPPING["low"]] * len(df)
+
+        # Compute statements and hashes for all requirements in one pass each
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        statements = [
+            _statement_json(req_id, title, description, status, priority,
+                            page, keyword, confidence, created_by, "1", timestamp)
+            for req_id, title, description, status, priority, page, keyword, confidence
+            in zip(req_ids, titles, descriptions, statuses, priorities, pages, keywords, confidences)
+        ]
+        # Descriptions often repeat verbatim; hash each distinct text only once
+        hash_by_description = {description: calculate_md5_hash(description)
+                               for description in dict.fromkeys(descriptions)}
+        hashes = [hash_by_description[description] for description in descriptions]
+
+        # Stream the document: header fields, then the File + Annotation elements
+        # one per line as they are built, so the element list never exists in memory
+        with open(output_path, 'wb') as f:
+            f.write(_dumps_bytes(spdx_document)[:-1] + b',"element":[')
+            separator = b'\n'
+            for args in zip(map(str, req_ids), titles, descriptions, hashes, statements):
+                file_elem, annotation_elem = _basil_elements(*args)
+                f.write(separator + _dumps_bytes(file_elem) + b',\n' + _dumps_bytes(annotation_elem))
+                separator = b',\n'
+            f.write(b'\n]}\n')
 
         logger.info(f"Successfully exported {len(df)} requirements to {output_path}")
         return True
@@ -261,6 +400,28 @@ def export_to_basil(df: pd.DataFrame, output_path: str,
         return False
 
 
+def _iter_basil_elements(input_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries of a BASIL document's "element" array.
+
+    With ijson installed the array is streamed, so peak memory no longer
+    grows with the size of the file; otherwise the document is loaded
+    with json.load.
+
+    Args:
+        input_path: Path to BASIL JSON-LD file
+
+    Yields:
+        Element dictionaries in document order
+    """
+    if IJSON_AVAILABLE:
+        with open(input_path, 'rb') as f:
+            yield from ijson.items(f, 'element.item', use_float=True)
+    else:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            yield from json.load(f).get("element", [])
+
+
 def import_from_basil(input_path: str) -> pd.DataFrame:
     """
     Import BASIL JSON-LD format to ReqBot requirements DataFrame.
@@ -282,38 +443,28 @@ def import_from_basil(input_path: str) -> pd.DataFrame:
     try:
         logger.info(f"Starting BASIL import from {input_path}")
 
-        # Read JSON-LD file
-        with open(input_path, 'r', encoding='utf-8') as f:
-            spdx_document = json.load(f)
-
-        # Extract elements
-        elements = spdx_document.get("element", [])
-
-        # Separate files and annotations
+        # Separate files and annotations in a single pass over the elements,
+        # keeping only the fields needed below rather than whole elements
         files = {}
         annotations = {}
 
-        for elem in elements:
+        for elem in _iter_basil_elements(input_path):
             elem_type = elem.get("type", "")
             if elem_type == BASIL_TYPE_FILE:
                 if elem.get("software_primaryPurpose") == BASIL_PURPOSE_REQUIREMENT:
                     spdx_id = elem.get("spdxId", "")
-                    files[spdx_id] = elem
+                    files[spdx_id] = (elem.get("name", ""), elem.get("description", ""), elem.get("comment", ""))
             elif elem_type == BASIL_ANNOTATION_TYPE:
                 subject = elem.get("subject", "")
-                annotations[subject] = elem
+                annotations[subject] = elem.get("statement", "{}")
 
         logger.info(f"Found {len(files)} requirement files and {len(annotations)} annotations")
 
-        # Build requirements list
-        requirements = []
-
-        for spdx_id, file_elem in files.items():
-            # Get basic info from file element
-            name = file_elem.get("name", "")
-            description = file_elem.get("description", "")
-            comment = file_elem.get("comment", "")
+        # Build the requirement columns directly (pandas takes a fast path for
+        # a dict of lists, no per-row dict construction and key matching)
+        labels, descriptions, pages, keywords, notes, priorities, confidences = [], [], [], [], [], [], []
 
+        for spdx_id, (name, description, comment) in files.items():
             # Extract ID from comment or spdxId
             req_id = 0
             if "ID" in comment:
@@ -335,15 +486,10 @@ def import_from_basil(input_path: str) -> pd.DataFrame:
             priority = "low"
 
             if spdx_id in annotations:
-                annotation = annotations[spdx_id]
-                statement = annotation.get("statement", "{}")
+                statement = annotations[spdx_id]
 
                 try:
-                    statement_data = json.loads(statement)
-
-                    # Map BASIL status back to ReqBot priority
-                    status = statement_data.get("status", "NEW")
-                    priority = REVERSE_STATUS_MAPPING.get(status, "low")
+                    statement_data = _loads(statement)
 
                     # Extract ReqBot-specific metadata if available
                     reqbot_meta = statement_data.get("reqbot_metadata", {})
@@ -351,8 +497,13 @@ def import_from_basil(input_path: str) -> pd.DataFrame:
                         page = reqbot_meta.get("page", 1)
                         keyword = reqbot_meta.get("keyword", "")
                         confidence = reqbot_meta.get("confidence", 0.0)
-                        # Use original priority if available
-                        priority = reqbot_meta.get("priority", priority)
+
+                    if reqbot_meta and "priority" in reqbot_meta:
+                        # Use original priority (always present in ReqBot exports)
+                        priority = reqbot_meta["priority"]
+                    else:
+                        # Map BASIL status back to ReqBot priority
+                        priority = REVERSE_STATUS_MAPPING.get(statement_data.get("status", "NEW"), "low")
 
                 except json.JSONDecodeError as e:
                     logger.warning(f"Failed to parse annotation statement for {spdx_id}: {str(e)}")
@@ -361,19 +512,25 @@ def import_from_basil(input_path: str) -> pd.DataFrame:
             label_number = f"BASIL-Req#{req_id}-1"
             note = f"{label_number}:{name}"
 
-            requirements.append({
-                'Label Number': label_number,
-                'Description': description,
-                'Page': page,
-                'Keyword': keyword,
-                'Raw': [],  # Empty for imported requirements
-                'Note': note,
-                'Priority': priority,
-                'Confidence': confidence
-            })
+            labels.append(label_number)
+            descriptions.append(description)
+            pages.append(page)
+            keywords.append(keyword)
+            notes.append(note)
+            priorities.append(priority)
+            confidences.append(confidence)
 
         # Create DataFrame
-        df = pd.DataFrame(requirements)
+        df = pd.DataFrame({
+            'Label Number': labels,
+            'Description': descriptions,
+            'Page': pages,
+            'Keyword': keywords,
+            'Raw': [[] for _ in labels],  # Empty for imported requirements
+            'Note': notes,
+            'Priority': priorities,
+            'Confidence': confidences
+        })
 
         logger.info(f"Successfully imported {len(df)} requirements from BASIL format")
         return df
@@ -447,23 +604,27 @@ def merge_basil_requirements(existing_df: pd.DataFrame,
         logger.info(f"Appended {len(imported_df)} requirements to {len(existing_df)} existing")
 
     elif merge_strategy == "update":
-        # Update existing requirements with matching IDs
+        # Update existing requirements with matching IDs using a label join instead of
+        # scanning the whole frame for every imported row.
+        # The last imported row wins for duplicated labels.
         result = existing_df.copy()
-        for _, imported_row in imported_df.iterrows():
-            label = imported_row['Label Number']
-            # Find matching requirement in existing
-            mask = result['Label Number'] == label
-            if mask.any():
-                # Update existing row - use row index to avoid pandas list assignment issues
-                idx = result[mask].index[0]
-                for col in imported_df.columns:
-                    result.at[idx, col] = imported_row[col]
-                logger.debug(f"Updated requirement {label}")
-            else:
-                # Add new requirement
-                result = pd.concat([result, imported_row.to_frame().T], ignore_index=True)
-                logger.debug(f"Added new requirement {label}")
-        logger.info(f"Updated/added {len(imported_df)} requirements")
+        imported_labels = imported_df['Label Number']
+        imported = imported_df.drop_duplicates(subset='Label Number', keep='last').set_index('Label Number')
+
+        # Only the first existing row carrying a label is updated
+        existing_labels = result['Label Number']
+        update_mask = existing_labels.isin(imported.index) & ~existing_labels.duplicated()
+        if update_mask.any():
+            matched = imported.loc[existing_labels[update_mask]]
+            for col in imported.columns:
+                result.loc[update_mask, col] = matched[col].to_numpy()
+
+        # Append new labels in first-seen order, carrying their last imported values
+        new_labels = imported_labels[~imported_labels.isin(existing_labels)].drop_duplicates()
+        new_rows = imported.loc[new_labels].reset_index()[imported_df.columns]
+        if not new_rows.empty:
+            result = pd.concat([result, new_rows], ignore_index=True)
+        logger.info(f"Updated {int(update_mask.sum())} and added {len(new_rows)} requirements")
 
     elif merge_strategy == "replace":
         # Replace all existing with imported
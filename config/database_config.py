@@ -5,8 +5,12 @@ This module manages database configuration settings, supporting both
 SQLite (default) and PostgreSQL databases.
 """
 
+import functools
 import os
 from pathlib import Path
+from types import MappingProxyType
+
+from sqlalchemy import URL, make_url
 
 # ============================================================================
 # Database Configuration
@@ -21,6 +25,10 @@ LEGACY_MODE = os.getenv('REQBOT_LEGACY_MODE', 'false').lower() == 'true'
 # Database type: 'sqlite' or 'postgresql'
 DATABASE_TYPE = os.getenv('REQBOT_DB_TYPE', 'sqlite')
 
+# Backend flags, fixed for the lifetime of the process
+IS_SQLITE = DATABASE_TYPE == 'sqlite'
+IS_POSTGRESQL = DATABASE_TYPE == 'postgresql'
+
 # ============================================================================
 # SQLite Configuration (Default)
 # ============================================================================
@@ -35,6 +43,13 @@ SQLITE_URL = f'sqlite:///{SQLITE_DB_PATH}'
 SQLITE_TIMEOUT = 30  # seconds
 SQLITE_CHECK_SAME_THREAD = False  # Allow multi-threaded access
 
+# SQLite PRAGMA tuning (applied to every new connection)
+# Page cache per connection (64MB); the pool may hold up to POOL_SIZE + MAX_OVERFLOW connections
+SQLITE_CACHE_KB = int(os.getenv('REQBOT_SQLITE_CACHE_KB', '65536'))
+SQLITE_PAGE_SIZE = 8192  # bytes, only takes effect when the database file is created
+SQLITE_WAL_AUTOCHECKPOINT = int(os.getenv('REQBOT_SQLITE_WAL_AUTOCHECKPOINT', '1000'))  # pages
+SQLITE_BUSY_TIMEOUT_MS = SQLITE_TIMEOUT * 1000  # Wait for locks instead of failing with "database is locked"
+
 # ============================================================================
 # PostgreSQL Configuration (Optional)
 # ============================================================================
@@ -46,11 +61,16 @@ POSTGRES_DB = os.getenv('REQBOT_PG_DB', 'reqbot')
 POSTGRES_USER = os.getenv('REQBOT_PG_USER', 'reqbot')
 POSTGRES_PASSWORD = os.getenv('REQBOT_PG_PASSWORD', '')
 
-# PostgreSQL connection URL
-POSTGRES_URL = (
-    f'postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@'
-    f'{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}'
+# PostgreSQL connection URL (URL.create escapes special characters in the credentials)
+POSTGRES_URL_OBJ = URL.create(
+    'postgresql',
+    username=POSTGRES_USER,
+    password=POSTGRES_PASSWORD,
+    host=POSTGRES_HOST,
+    port=POSTGRES_PORT,
+    database=POSTGRES_DB,
 )
+POSTGRES_URL = POSTGRES_URL_OBJ.render_as_string(hide_password=False)
 
 # ============================================================================
 # Active Database URL
@@ -64,7 +84,7 @@ def get_database_url():
     Returns:
         str: SQLAlchemy-compatible database URL
     """
-    if DATABASE_TYPE == 'postgresql':
+    if IS_POSTGRESQL:
         return POSTGRES_URL
     else:
         return SQLITE_URL
@@ -72,6 +92,9 @@ def get_database_url():
 
 DATABASE_URL = get_database_url()
 
+# Parsed once and passed to create_engine as-is
+DATABASE_URL_OBJ = POSTGRES_URL_OBJ if IS_POSTGRESQL else make_url(SQLITE_URL)
+
 # ============================================================================
 # SQLAlchemy Configuration
 # ============================================================================
@@ -99,6 +122,15 @@ MIGRATION_DIR = os.path.join(os.path.dirname(__file__), '..', 'database', 'migra
 # Batch insert size for bulk operations
 BATCH_INSERT_SIZE = 1000
 
+# Rows buffered per fetch when streaming large result sets (exports, reports)
+STREAM_CHUNK_SIZE = 1000
+
+# File hashes memoized per process, keyed by (path, mtime, size)
+FILE_HASH_CACHE_SIZE = int(os.getenv('REQBOT_FILE_HASH_CACHE_SIZE', '8192'))
+
+# Threads hashing the files of a batch in parallel (hashlib releases the GIL)
+HASH_WORKERS = int(os.getenv('REQBOT_HASH_WORKERS', str(min(8, os.cpu_count() or 1))))
+
 # Enable query result caching
 ENABLE_QUERY_CACHE = True
 
@@ -123,10 +155,14 @@ MAX_BACKUPS = 10
 # ============================================================================
 
 
+@functools.lru_cache(maxsize=1)
 def get_sqlite_path():
     """
     Get the absolute path to the SQLite database file.
 
+    The path is resolved against the working directory on first use and
+    cached; call get_sqlite_path.cache_clear() if SQLITE_DB_PATH is patched.
+
     Returns:
         Path: Absolute path to database file
     """
@@ -140,7 +176,7 @@ def is_sqlite():
     Returns:
         bool: True if using SQLite
     """
-    return DATABASE_TYPE == 'sqlite'
+    return IS_SQLITE
 
 
 def is_postgresql():
@@ -150,7 +186,39 @@ def is_postgresql():
     Returns:
         bool: True if using PostgreSQL
     """
-    return DATABASE_TYPE == 'postgresql'
+    return IS_POSTGRESQL
+
+
+# Engine options per database type, built once at import
+_BASE_ENGINE_OPTS = MappingProxyType({
+    'echo': ECHO_SQL,
+    'insertmanyvalues_page_size': BATCH_INSERT_SIZE,  # Rows per multi-row INSERT in executemany
+})
+
+_SQLITE_ENGINE_OPTS = MappingProxyType({
+    **_BASE_ENGINE_OPTS,
+    'connect_args': MappingProxyType({
+        'timeout': SQLITE_TIMEOUT,
+        'check_same_thread': SQLITE_CHECK_SAME_THREAD,
+    }),
+})
+
+_PG_ENGINE_OPTS = MappingProxyType({
+    **_BASE_ENGINE_OPTS,
+    'pool_pre_ping': True,  # Verify connections before using (TCP connections can go stale)
+    'pool_size': POOL_SIZE,
+    'max_overflow': MAX_OVERFLOW,
+    'pool_timeout': POOL_TIMEOUT,
+    'pool_recycle': POOL_RECYCLE,
+    'connect_args': MappingProxyType({
+        # JIT compilation costs more than it saves on ReqBot's short queries
+        'options': '-c jit=off',
+        'application_name': 'reqbot',
+    }),
+    # Batch bulk UPDATE/DELETE statements too, not just INSERTs
+    'executemany_mode': 'values_plus_batch',
+    'executemany_batch_page_size': 500,  # Statements per execute_batch() round trip
+})
 
 
 def get_engine_options():
@@ -158,29 +226,13 @@ def get_engine_options():
     Get SQLAlchemy engine options based on database type.
 
     Returns:
-        dict: Engine configuration options
+        dict: Engine configuration options (a fresh copy the caller may extend)
     """
-    base_options = {
-        'echo': ECHO_SQL,
-        'pool_pre_ping': True,  # Verify connections before using
-    }
-
-    if is_sqlite():
-        base_options.update({
-            'connect_args': {
-                'timeout': SQLITE_TIMEOUT,
-                'check_same_thread': SQLITE_CHECK_SAME_THREAD,
-            }
-        })
-    elif is_postgresql():
-        base_options.update({
-            'pool_size': POOL_SIZE,
-            'max_overflow': MAX_OVERFLOW,
-            'pool_timeout': POOL_TIMEOUT,
-            'pool_recycle': POOL_RECYCLE,
-        })
-
-    return base_options
+    if IS_SQLITE:
+        return dict(_SQLITE_ENGINE_OPTS)
+    if IS_POSTGRESQL:
+        return dict(_PG_ENGINE_OPTS)
+    return dict(_BASE_ENGINE_OPTS)
 
 
 # ============================================================================
@@ -195,8 +247,8 @@ def print_config():
     print(f"Database Enabled: {DATABASE_ENABLED}")
     print(f"Legacy Mode: {LEGACY_MODE}")
     print(f"Database Type: {DATABASE_TYPE}")
-    print(f"Database URL: {DATABASE_URL}")
-    if is_sqlite():
+    print(f"Database URL: {DATABASE_URL_OBJ.render_as_string(hide_password=True)}")
+    if IS_SQLITE:
         print(f"SQLite Path: {get_sqlite_path()}")
     print(f"Echo SQL: {ECHO_SQL}")
     print("=" * 60)
@@ -1,15 +1,58 @@
 import configparser
 import os
+import re
+
+# Cache dell'ultimo file letto: (percorso, mtime_ns, size) -> insieme di parole
+_KEYWORD_CACHE = {}
+
+# Riga "word_set = ..." non seguita da righe di continuazione indentate
+_WORD_SET_RE = re.compile(r'(?m)^word_set[ \t]*[=:][ \t]*(.*)$(?!\r?\n[ \t]+\S)')
+# Intestazione di sezione, come la riconosce configparser
+_SECTION_RE = re.compile(r'(?m)^\[(.+)\]')
 
 
 def load_keyword_config():
+    # Se il file non è cambiato dall'ultima lettura, restituisci le parole già lette
+    config_file_path = 'RBconfig.ini'
+    try:
+        stat_result = os.stat(config_file_path)
+        cache_key = (os.path.abspath(config_file_path), stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        cache_key = None
+    if cache_key in _KEYWORD_CACHE:
+        return _KEYWORD_CACHE[cache_key]
+
+    # frozenset: l'insieme in cache viene condiviso tra i chiamanti e non può essere modificato
+    word_set = frozenset(_read_keyword_config(config_file_path))
+    if cache_key is not None and word_set:
+        _KEYWORD_CACHE.clear()
+        _KEYWORD_CACHE[cache_key] = word_set
+    return word_set
+
+
+def _parse_word_set(config_file_path):
+    # Lettura diretta del file: evita configparser nel caso comune di una sola chiave word_set.
+    # Restituisce None se il file non ha la forma attesa, così si ricade su configparser.
+    try:
+        with open(config_file_path, 'rb') as config_file:
+            text = config_file.read().decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+    matches = list(_WORD_SET_RE.finditer(text))
+    if len(matches) != 1:
+        return None
+    # configparser legge solo [DEFAULT_KEYWORD]: la chiave deve stare proprio in quella sezione
+    sections = _SECTION_RE.findall(text, 0, matches[0].start())
+    if not sections or sections[-1] != 'DEFAULT_KEYWORD' or _SECTION_RE.findall(text).count('DEFAULT_KEYWORD') != 1:
+        return None
+    return {word for word in map(str.strip, matches[0].group(1).split(',')) if word} or None
+
+
+def _read_keyword_config(config_file_path):
     word_set = {}
     # Insieme di parole predefinito
     default_word_set = {'must', 'shall', 'should', 'has to', 'scope', 'recommended', 'ensuring', 'ensures', 'ensure'}
 
-    # Percorso del file di configurazione
-    config_file_path = 'RBconfig.ini'
-
     # Verifica se il file esiste
     if not os.path.exists(config_file_path):
         # Crea un nuovo file di configurazione con i valori predefiniti
@@ -22,6 +65,9 @@ def load_keyword_config():
 
         # Popola word_set con i valori predefiniti
         word_set = default_word_set
+    elif (parsed := _parse_word_set(config_file_path)) is not None:
+        word_set = parsed
+        print(f"Parole lette dal file di configurazione: {word_set}")
     else:
         # Leggi il file di configurazione esistente
         config = configparser.ConfigParser()
@@ -30,10 +76,8 @@ def load_keyword_config():
 
             # Ottieni l'insieme di parole dal file di configurazione
             word_set_str = config.get('DEFAULT_KEYWORD', 'word_set')
-            word_set = set(word_set_str.split(','))
-
-            # Filtra gli elementi vuoti
-            word_set = {word for word in word_set if word.strip()}
+            # Rimuovi gli spazi e filtra gli elementi vuoti in un solo passaggio
+            word_set = {word for word in map(str.strip, word_set_str.split(',')) if word}
 
             if not word_set:  # Verifica se word_set è vuoto dopo la rimozione degli elementi vuoti
                 print("Il file di configurazione non contiene parole valide. Riscrivere con i valori predefiniti.")
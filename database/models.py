@@ -8,14 +8,29 @@ Supports both SQLite and PostgreSQL databases.
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum as PyEnum
+from json import dumps as json_dumps, loads as json_loads
 import logging
+import zlib
 
 from sqlalchemy import (
-    Integer, String, Text, Float, Boolean, DateTime,
-    ForeignKey, JSON, Index, UniqueConstraint, Enum
+    BigInteger, Integer, String, Text, Float, Boolean, DateTime, LargeBinary,
+    ForeignKey, Identity, JSON, Index, UniqueConstraint, CheckConstraint
 )
-from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import DeclarativeBase, backref, relationship, Mapped, mapped_column
+from sqlalchemy.sql import func, text, true, false
+from sqlalchemy.sql.functions import FunctionElement
+
+# Optional: zstandard reads history snapshots that were written zstd-compressed
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
 
 # Logger for this module
 logger = logging.getLogger(__name__)
@@ -57,6 +72,132 @@ class ChangeType(str, PyEnum):
     MERGED = "merged"
 
 
+# ============================================================================
+# Enum Column Type
+# ============================================================================
+
+class EnumName(TypeDecorator):
+    """
+    Stores a str-based enum in a plain VARCHAR column, by member name.
+
+    Uses the same stored values as SQLAlchemy's Enum type ('HIGH', 'PENDING', ...),
+    so existing SQLite databases read back unchanged, but binding and loading are
+    single dict lookups. Accepts enum members, names or values on write.
+    """
+    impl = String(16)
+    cache_ok = True
+
+    def __init__(self, enum_class):
+        super().__init__()
+        self.enum_class = enum_class
+        # Members compare and hash equal to their values, so one dict covers all inputs
+        self._names = {member.name: member.name for member in enum_class}
+        self._names.update({member.value: member.name for member in enum_class})
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._names[value]
+        except KeyError:
+            raise LookupError(f"'{value}' is not a valid {self.enum_class.__name__}") from None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.enum_class[value]
+
+
+# JSON columns are stored as JSONB on PostgreSQL (binary, GIN-indexable); plain JSON elsewhere
+JSON_TYPE = JSON().with_variant(JSONB(), "postgresql")
+
+# Keys of the high-volume requirement tables. SQLite only auto-assigns rowids to
+# INTEGER PRIMARY KEY columns, and its INTEGER is 64-bit anyway.
+BIG_ID_TYPE = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class HexDigest(TypeDecorator):
+    """
+    Stores a hex digest string (MD5, SHA-256, ...) as raw bytes.
+
+    Halves the size of the column and of every index on it, while callers keep
+    working with hex strings. Rows written as hex text by older versions are
+    returned unchanged.
+    """
+    impl = LargeBinary(32)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return bytes.fromhex(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return bytes(value).hex()
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    Stores a JSON document as a compressed blob.
+
+    Meant for large, rarely read audit data such as requirement history snapshots.
+    Writes always use zlib, so every installation can read them back. Reads detect
+    the format from the frame header: zstd frames are decoded when zstandard is
+    installed, and rows written as JSON text by older versions are decoded unchanged.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = json_dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return zlib.compress(data)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, (dict, list)):
+            return value
+        if isinstance(value, str):
+            return json_loads(value)
+        data = bytes(value)
+        if data.startswith(self.ZSTD_MAGIC):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("Snapshot is zstandard-compressed; install the 'zstandard' package to read it")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = zlib.decompress(data)
+        return json_loads(data)
+
+
+class confidence_decile(FunctionElement):
+    """SQL for int(score * 10): the 0-10 decile of a confidence score, truncated."""
+    type = Integer()
+    name = 'confidence_decile'
+    inherit_cache = True
+
+
+@compiles(confidence_decile)
+def _compile_confidence_decile(element, compiler, **kw):
+    # CAST truncates on SQLite; the factor stays literal so queries match the index expression
+    return f"CAST({compiler.process(element.clauses, **kw)} * 10 AS INTEGER)"
+
+
+@compiles(confidence_decile, 'postgresql')
+def _compile_confidence_decile_pg(element, compiler, **kw):
+    # PostgreSQL's CAST rounds, so truncate first
+    return f"CAST(TRUNC({compiler.process(element.clauses, **kw)} * 10) AS INTEGER)"
+
+
+def enum_check(column: str, enum_class) -> CheckConstraint:
+    """CHECK constraint limiting an EnumName column to the enum's member names."""
+    names = ", ".join(f"'{member.name}'" for member in enum_class)
+    return CheckConstraint(f"{column} IN ({names})", name=f"ck_{column}_{enum_class.__name__.lower()}")
+
+
 # ============================================================================
 # Base Model
 # ============================================================================
@@ -91,27 +232,33 @@ class Project(Base):
     compliance_matrix_template: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now(), onupdate=datetime.now, nullable=False)
 
     # Status
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true(), nullable=False)
 
     # Additional Data (flexible JSON field for additional settings)
     # Note: 'metadata' is reserved by SQLAlchemy, so we use 'additional_data'
-    additional_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    additional_data: Mapped[Optional[dict]] = mapped_column(JSON_TYPE, nullable=True)
 
-    # Relationships
-    documents: Mapped[List["Document"]] = relationship("Document", back_populates="project", cascade="all, delete-orphan")
+    # Relationships (collections stay lazy; use selectinload() where a caller needs them).
+    # Project.requirements loads every row at once: iterate large projects with
+    # RequirementService.stream_requirements() instead.
+    documents: Mapped[List["Document"]] = relationship(
+        "Document", back_populates="project", cascade="all, delete-orphan", lazy="select")
     requirements: Mapped[List["Requirement"]] = relationship(
-        "Requirement", back_populates="project", cascade="all, delete-orphan")
+        "Requirement", back_populates="project", cascade="all, delete-orphan", lazy="select")
     processing_sessions: Mapped[List["ProcessingSession"]] = relationship(
-        "ProcessingSession", back_populates="project", cascade="all, delete-orphan")
+        "ProcessingSession", back_populates="project", cascade="all, delete-orphan", lazy="select")
 
     # Indexes
     __table_args__ = (
         Index('ix_projects_created_at', 'created_at'),
-        Index('ix_projects_is_active', 'is_active'),
+        # Active-project listing (get_all_projects), newest first
+        Index('ix_projects_active_created', 'created_at',
+              postgresql_where=text('is_active IS TRUE'), sqlite_where=text('is_active IS 1')),
         Index('ix_projects_name', 'name'),
     )
 
@@ -140,36 +287,39 @@ class Document(Base):
     # Document Information
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
-    file_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # MD5 or SHA256
+    file_hash: Mapped[str] = mapped_column(HexDigest, nullable=False)  # BLAKE2b-256 (legacy: MD5) hex digest, stored raw
     file_size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     page_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Processing Status
     processing_status: Mapped[ProcessingStatus] = mapped_column(
-        Enum(ProcessingStatus),
+        EnumName(ProcessingStatus),
         default=ProcessingStatus.PENDING,
+        server_default=ProcessingStatus.PENDING.name,
         nullable=False
     )
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now(), onupdate=datetime.now, nullable=False)
 
     # Additional Data
-    additional_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    additional_data: Mapped[Optional[dict]] = mapped_column(JSON_TYPE, nullable=True)
 
     # Relationships
-    project: Mapped["Project"] = relationship("Project", back_populates="documents")
+    project: Mapped["Project"] = relationship("Project", back_populates="documents", lazy="select")
     requirements: Mapped[List["Requirement"]] = relationship(
-        "Requirement", back_populates="document", cascade="all, delete-orphan")
+        "Requirement", back_populates="document", cascade="all, delete-orphan", lazy="select")
 
     # Constraints and Indexes
     __table_args__ = (
         UniqueConstraint('project_id', 'file_hash', name='uix_project_file_hash'),
-        Index('ix_documents_project_id', 'project_id'),
+        enum_check('processing_status', ProcessingStatus),
+        # Documents of a project, optionally filtered by status
+        Index('ix_doc_project_status', 'project_id', 'processing_status'),
         Index('ix_documents_file_hash', 'file_hash'),
-        Index('ix_documents_processing_status', 'processing_status'),
         Index('ix_documents_processed_at', 'processed_at'),
     )
 
@@ -191,7 +341,7 @@ class Requirement(Base):
     __tablename__ = 'requirements'
 
     # Primary Key
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIG_ID_TYPE, Identity(always=False, cache=1000), primary_key=True)
 
     # Foreign Keys
     document_id: Mapped[int] = mapped_column(Integer, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False)
@@ -202,7 +352,9 @@ class Requirement(Base):
 
     # Requirement Content
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    raw_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Original extracted text
+    # Original extracted text; deferred with additional_data (see below) so list and report
+    # queries do not fetch these rarely read payloads
+    raw_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group='detail')
 
     # Location
     page_number: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -210,7 +362,7 @@ class Requirement(Base):
     # Classification
     keyword: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Matching keyword
     priority: Mapped[Optional[Priority]] = mapped_column(
-        Enum(Priority),
+        EnumName(Priority),
         nullable=True
     )
     category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Functional, Safety, etc.
@@ -219,46 +371,77 @@ class Requirement(Base):
     confidence_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 0.0 to 1.0
 
     # Processing Info
-    extracted_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
-    extraction_method: Mapped[str] = mapped_column(String(100), default='spacy_nlp', nullable=False)
+    extracted_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    extraction_method: Mapped[str] = mapped_column(
+        String(100), default='spacy_nlp', server_default='spacy_nlp', nullable=False)
 
     # Version Control
-    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
-    is_current: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default=text('1'), nullable=False)
+    is_current: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true(), nullable=False)
     parent_requirement_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey('requirements.id', ondelete='SET NULL'), nullable=True)
+        BIG_ID_TYPE, ForeignKey('requirements.id', ondelete='SET NULL'), nullable=True)
 
     # User Modifications
-    is_manually_edited: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_manually_edited: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
     edited_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Additional Data
-    additional_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    additional_data: Mapped[Optional[dict]] = mapped_column(
+        JSON_TYPE, nullable=True, deferred=True, deferred_group='detail')
 
     # Relationships
-    document: Mapped["Document"] = relationship("Document", back_populates="requirements")
-    project: Mapped["Project"] = relationship("Project", back_populates="requirements")
+    # Requirements are loaded in bulk, so touching document/project per row would issue
+    # one query each (N+1). Those loads must be requested explicitly with joinedload().
+    document: Mapped["Document"] = relationship("Document", back_populates="requirements", lazy="raise_on_sql")
+    project: Mapped["Project"] = relationship("Project", back_populates="requirements", lazy="raise_on_sql")
+    # Version chains are read in one query (RequirementService.get_requirement_lineage),
+    # not by walking these one row at a time
     parent_requirement: Mapped[Optional["Requirement"]] = relationship(
-        "Requirement", remote_side=[id], backref="child_requirements")
+        "Requirement", remote_side=[id], lazy="raise_on_sql",
+        backref=backref("child_requirements", lazy="raise_on_sql", passive_deletes=True))
     history: Mapped[List["RequirementHistory"]] = relationship(
-        "RequirementHistory", back_populates="requirement", cascade="all, delete-orphan")
+        "RequirementHistory", back_populates="requirement", cascade="all, delete-orphan", lazy="select")
 
     # Indexes
     __table_args__ = (
         Index('ix_requirements_document_id', 'document_id'),
-        Index('ix_requirements_project_id', 'project_id'),
-        Index('ix_requirements_is_current', 'is_current'),
-        Index('ix_requirements_confidence_score', 'confidence_score'),
-        Index('ix_requirements_priority', 'priority'),
-        Index('ix_requirements_category', 'category'),
-        Index('ix_requirements_extracted_at', 'extracted_at'),
+        # Current requirements of a project (also serves project_id lookups and cascades)
+        Index('ix_req_project_current_extracted', 'project_id', 'is_current', 'extracted_at'),
         Index('ix_requirements_label_number', 'label_number'),
+        # Only derived versions have a parent, so the partial index stays tiny
+        Index('ix_requirements_parent_id', 'parent_requirement_id',
+              postgresql_where=text('parent_requirement_id IS NOT NULL'),
+              sqlite_where=text('parent_requirement_id IS NOT NULL')),
+        # At most one current version per label in a document
+        Index('uix_req_current_label', 'document_id', 'label_number', unique=True,
+              postgresql_where=text('is_current'), sqlite_where=text('is_current = 1')),
+        # Containment queries on additional_data (PostgreSQL only)
+        Index('ix_requirements_additional_data_gin', 'additional_data',
+              postgresql_using='gin').ddl_if(dialect='postgresql'),
+        enum_check('priority', Priority),
     )
 
+    @hybrid_property
+    def confidence_bucket(self) -> Optional[int]:
+        """Confidence decile (0-10) used for histograms."""
+        if self.confidence_score is None:
+            return None
+        return int(self.confidence_score * 10)
+
+    @confidence_bucket.inplace.expression
+    @classmethod
+    def _confidence_bucket_expression(cls):
+        return confidence_decile(cls.confidence_score)
+
     def __repr__(self):
         return f"<Requirement(id={self.id}, label='{self.label_number}', priority='{self.priority}')>"
 
 
+# Confidence histograms of a project's current requirements are answered from this
+# expression index alone, without storing the bucket as a column
+Index('ix_req_project_bucket', Requirement.project_id, Requirement.is_current, Requirement.confidence_bucket)
+
+
 # ============================================================================
 # Requirement History Model
 # ============================================================================
@@ -272,10 +455,11 @@ class RequirementHistory(Base):
     __tablename__ = 'requirement_history'
 
     # Primary Key
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIG_ID_TYPE, Identity(always=False, cache=1000), primary_key=True)
 
     # Foreign Keys
-    requirement_id: Mapped[int] = mapped_column(Integer, ForeignKey('requirements.id', ondelete='CASCADE'), nullable=False)
+    requirement_id: Mapped[int] = mapped_column(
+        BIG_ID_TYPE, ForeignKey('requirements.id', ondelete='CASCADE'), nullable=False)
 
     # Version Info
     version: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -283,7 +467,7 @@ class RequirementHistory(Base):
     # Snapshot of requirement at this version
     description: Mapped[str] = mapped_column(Text, nullable=False)
     priority: Mapped[Optional[Priority]] = mapped_column(
-        Enum(Priority),
+        EnumName(Priority),
         nullable=True
     )
     category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -291,24 +475,29 @@ class RequirementHistory(Base):
 
     # Change Tracking
     change_type: Mapped[ChangeType] = mapped_column(
-        Enum(ChangeType),
+        EnumName(ChangeType),
         nullable=False
     )
     change_description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     changed_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Future: user ID
-    changed_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
 
-    # Full Snapshot (stores complete requirement state)
-    snapshot_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Full Snapshot (stores complete requirement state, compressed)
+    snapshot_data: Mapped[Optional[dict]] = mapped_column(CompressedJSON, nullable=True)
 
     # Relationships
-    requirement: Mapped["Requirement"] = relationship("Requirement", back_populates="history")
+    requirement: Mapped["Requirement"] = relationship("Requirement", back_populates="history", lazy="raise_on_sql")
 
     # Indexes
     __table_args__ = (
-        Index('ix_requirement_history_requirement_id', 'requirement_id'),
-        Index('ix_requirement_history_changed_at', 'changed_at'),
-        Index('ix_requirement_history_version', 'version'),
+        # History of one requirement in version order (also serves the CASCADE delete)
+        Index('ix_requirement_history_req_version', 'requirement_id', 'version'),
+        # Rows are appended in changed_at order, so a BRIN index answers time ranges
+        # for a fraction of a B-tree's size and insert cost (PostgreSQL only)
+        Index('ix_requirement_history_changed_at', 'changed_at',
+              postgresql_using='brin').ddl_if(dialect='postgresql'),
+        enum_check('priority', Priority),
+        enum_check('change_type', ChangeType),
     )
 
     def __repr__(self):
@@ -334,11 +523,12 @@ class ProcessingSession(Base):
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
 
     # Session Info
-    started_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     status: Mapped[SessionStatus] = mapped_column(
-        Enum(SessionStatus),
+        EnumName(SessionStatus),
         default=SessionStatus.RUNNING,
+        server_default=SessionStatus.RUNNING.name,
         nullable=False
     )
 
@@ -348,8 +538,8 @@ class ProcessingSession(Base):
     confidence_threshold: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Results
-    documents_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    requirements_extracted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    documents_processed: Mapped[int] = mapped_column(Integer, default=0, server_default=text('0'), nullable=False)
+    requirements_extracted: Mapped[int] = mapped_column(Integer, default=0, server_default=text('0'), nullable=False)
 
     # Quality Metrics
     avg_confidence_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -359,29 +549,32 @@ class ProcessingSession(Base):
     # Outputs
     excel_output_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     basil_output_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    pdf_output_paths: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    pdf_output_paths: Mapped[Optional[list]] = mapped_column(JSON_TYPE, nullable=True)
     report_output_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Performance
     processing_time_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Issues
-    warnings_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    errors_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    warnings: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
-    errors: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    warnings_count: Mapped[int] = mapped_column(Integer, default=0, server_default=text('0'), nullable=False)
+    errors_count: Mapped[int] = mapped_column(Integer, default=0, server_default=text('0'), nullable=False)
+    warnings: Mapped[Optional[list]] = mapped_column(JSON_TYPE, nullable=True)
+    errors: Mapped[Optional[list]] = mapped_column(JSON_TYPE, nullable=True)
 
     # Additional Data
-    additional_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    additional_data: Mapped[Optional[dict]] = mapped_column(JSON_TYPE, nullable=True)
 
     # Relationships
-    project: Mapped["Project"] = relationship("Project", back_populates="processing_sessions")
+    project: Mapped["Project"] = relationship("Project", back_populates="processing_sessions", lazy="select")
 
     # Indexes
     __table_args__ = (
-        Index('ix_processing_sessions_project_id', 'project_id'),
-        Index('ix_processing_sessions_started_at', 'started_at'),
-        Index('ix_processing_sessions_status', 'status'),
+        # Latest sessions of a project; on PostgreSQL the summary columns ride along in
+        # the index (INCLUDE) so listing them needs no heap access
+        Index('ix_sessions_project_started', 'project_id', started_at.desc(),
+              postgresql_include=['status', 'requirements_extracted', 'avg_confidence_score',
+                                  'processing_time_seconds']),
+        enum_check('status', SessionStatus),
     )
 
     def __repr__(self):
@@ -409,19 +602,17 @@ class KeywordProfile(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Keywords (JSON array)
-    keywords: Mapped[list] = mapped_column(JSON, nullable=False)
+    keywords: Mapped[list] = mapped_column(JSON_TYPE, nullable=False)
 
     # Profile Type
-    is_predefined: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_predefined: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now(), onupdate=datetime.now, nullable=False)
 
-    # Indexes
-    __table_args__ = (
-        Index('ix_keyword_profiles_name', 'name'),
-    )
+    # No extra indexes: the UNIQUE constraint on name already provides one
 
     def __repr__(self):
         return f"<KeywordProfile(id={self.id}, name='{self.name}')>"
@@ -7,18 +7,94 @@ processing status, and duplicate detection via file hashing.
 
 import logging
 import hashlib
-from typing import List, Optional, Tuple
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from database.models import Document, ProcessingStatus
 from database.database import DatabaseSession
+from config.database_config import BATCH_INSERT_SIZE, FILE_HASH_CACHE_SIZE, HASH_WORKERS
 
 logger = logging.getLogger(__name__)
 
+# Hex length of the MD5 digests stored by older versions
+_LEGACY_MD5_HEX_LENGTH = 32
+# Stored lengths of those digests: raw bytes, or hex text from before HexDigest
+_LEGACY_MD5_STORED_LENGTHS = (16, _LEGACY_MD5_HEX_LENGTH)
+
+# Size of each of the three windows (start, middle, end) read by _fast_fingerprint
+_FINGERPRINT_WINDOW = 64 * 1024
+# additional_data key holding the quick-check fingerprint of a document
+_FINGERPRINT_KEY = 'fingerprint'
+
+# Read size when streaming a file through a hash: few syscalls, still cache friendly
+_HASH_READ_SIZE = 1024 * 1024
+# Files up to this size are hashed in one call over a memory map instead of streamed
+_HASH_MMAP_MAX_SIZE = 8 * 1024 * 1024
+
+
+def _hash_stream(hasher, file_path: str) -> str:
+    """
+    Feed a whole file through a hashlib-style hasher and return its hex digest.
+
+    Reads 1 MiB at a time into one reused buffer, and asks the kernel for
+    aggressive readahead where posix_fadvise is available.
+    """
+    buffer = bytearray(_HASH_READ_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=FILE_HASH_CACHE_SIZE)
+def _hash_file(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Hash a file's contents; memoized on (path, mtime, size).
+
+    Any edit to the file changes its mtime or size and therefore misses the
+    cache. Errors propagate so that failures are never cached. Small files are
+    hashed in one call over a memory map, larger ones streamed.
+    """
+    hasher = hashlib.blake2b(digest_size=32)
+    if 0 < size <= _HASH_MMAP_MAX_SIZE:
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            hasher.update(mm)
+        return hasher.hexdigest()
+    return _hash_stream(hasher, file_path)
+
+
+@lru_cache(maxsize=FILE_HASH_CACHE_SIZE)
+def _sample_file(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Hash the start, middle and end windows of a file; memoized like _hash_file.
+
+    Files no larger than the three windows together are hashed entirely.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        if size <= 3 * _FINGERPRINT_WINDOW:
+            hasher.update(f.read())
+        else:
+            for offset in (0, size // 2 - _FINGERPRINT_WINDOW // 2, size - _FINGERPRINT_WINDOW):
+                f.seek(offset)
+                hasher.update(f.read(_FINGERPRINT_WINDOW))
+    return hasher.hexdigest()
+
 
 class DocumentService:
     """Service class for Document-related operations."""
@@ -26,24 +102,120 @@ class DocumentService:
     @staticmethod
     def calculate_file_hash(file_path: str) -> str:
         """
-        Calculate MD5 hash of a file for change detection.
+        Calculate a 256-bit hash of a file for change detection.
+
+        Always BLAKE2b-256 (64 hex characters), so stored hashes stay comparable
+        across installations. Results are memoized per process until the file's
+        mtime or size changes.
 
         Args:
             file_path: Path to file
 
         Returns:
-            str: MD5 hash string
+            str: Hex digest string, or "" if the file cannot be read
         """
-        hash_md5 = hashlib.md5()
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            stat = os.stat(file_path)
+            return _hash_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             logger.error(f"Failed to calculate hash for {file_path}: {e}")
             return ""
 
+    @staticmethod
+    def _map_files(func, file_paths: List[str]) -> List:
+        """Apply a per-file function (hashing, fingerprinting) to many files in parallel threads."""
+        if len(file_paths) <= 1 or HASH_WORKERS <= 1:
+            return [func(file_path) for file_path in file_paths]
+        with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(file_paths))) as executor:
+            return list(executor.map(func, file_paths))
+
+    @staticmethod
+    def clear_hash_cache() -> None:
+        """Drop all memoized file hashes and fingerprints."""
+        _hash_file.cache_clear()
+        _sample_file.cache_clear()
+
+    @staticmethod
+    def _hash_matches(stored_hash: Optional[str], current_hash: str, file_path: str) -> bool:
+        """
+        Compare a stored document hash with the current one.
+
+        Documents recorded by older versions carry an MD5 digest; those are
+        verified with MD5 so that upgrading does not reprocess every file.
+        """
+        if not stored_hash or not current_hash:
+            return False
+        if stored_hash == current_hash:
+            return True
+        if len(stored_hash) != _LEGACY_MD5_HEX_LENGTH:
+            return False
+
+        return DocumentService._legacy_hash(file_path) == stored_hash
+
+    @staticmethod
+    def _legacy_hash(file_path: str) -> str:
+        """MD5 hex digest of a file, for comparison with documents stored by older versions."""
+        try:
+            return _hash_stream(hashlib.md5(), file_path)
+        except Exception as e:
+            logger.error(f"Failed to calculate legacy hash for {file_path}: {e}")
+            return ""
+
+    @staticmethod
+    def _fast_fingerprint(file_path: str) -> Optional[dict]:
+        """
+        Cheap quick-check fingerprint of a file.
+
+        Hashes three 64 KiB windows (start, middle, end) instead of the whole
+        file; small files are hashed entirely. Together with the size and
+        mtime this identifies an unchanged file without reading all of it.
+        Like file hashes, samples are memoized until the mtime or size changes.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            dict: {'size', 'mtime_ns', 'sample'} or None if the file cannot be read
+        """
+        try:
+            stat = os.stat(file_path)
+            sample = _sample_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logger.error(f"Failed to fingerprint {file_path}: {e}")
+            return None
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sample': sample}
+
+    @staticmethod
+    def _fingerprint_matches(doc: Document, fingerprint: Optional[dict]) -> bool:
+        """Return True if the document was recorded from a file with this fingerprint."""
+        if fingerprint is None or doc.file_size_bytes != fingerprint['size']:
+            return False
+        stored = (doc.additional_data or {}).get(_FINGERPRINT_KEY)
+        return bool(stored) and stored.get('mtime_ns') == fingerprint['mtime_ns'] \
+            and stored.get('sample') == fingerprint['sample']
+
+    @staticmethod
+    def _record_fingerprint(doc: Document, fingerprint: Optional[dict]) -> None:
+        """Store the file size and quick-check fingerprint on the document."""
+        if fingerprint is None:
+            return
+        doc.file_size_bytes = fingerprint['size']
+        # Reassign rather than mutate so the JSON column is flagged as changed
+        doc.additional_data = {
+            **(doc.additional_data or {}),
+            _FINGERPRINT_KEY: {'mtime_ns': fingerprint['mtime_ns'], 'sample': fingerprint['sample']},
+        }
+
+    @staticmethod
+    def _mark_changed(doc: Document, file_path: str, current_hash: str, fingerprint: Optional[dict]) -> None:
+        """Record new file contents on a document and queue it for reprocessing."""
+        doc.file_hash = current_hash
+        doc.file_path = file_path
+        doc.processing_status = ProcessingStatus.PENDING
+        doc.processed_at = None
+        doc.updated_at = datetime.now()
+        DocumentService._record_fingerprint(doc, fingerprint)
+
     @staticmethod
     def create_document(
         project_id: int,
@@ -52,6 +224,7 @@ class DocumentService:
         file_hash: Optional[str] = None,
         page_count: Optional[int] = None,
         additional_data: Optional[dict] = None,
+        fingerprint: Optional[dict] = None,
         session: Optional[Session] = None
     ) -> Optional[Document]:
         """
@@ -64,6 +237,7 @@ class DocumentService:
             file_hash: File hash (calculated if not provided)
             page_count: Number of pages (optional)
             metadata: Additional metadata dict (optional)
+            fingerprint: Quick-check fingerprint already taken by the caller (optional)
             session: Database session (optional)
 
         Returns:
@@ -76,19 +250,11 @@ class DocumentService:
             else:
                 computed_hash = file_hash
 
-            # Get file size
-            file_size = None
-            try:
-                file_size = Path(file_path).stat().st_size
-            except Exception:
-                pass
-
             doc = Document(
                 project_id=project_id,
                 filename=filename,
                 file_path=file_path,
                 file_hash=computed_hash,
-                file_size_bytes=file_size,
                 page_count=page_count,
                 processing_status=ProcessingStatus.PENDING
             )
@@ -96,6 +262,12 @@ class DocumentService:
             if additional_data:
                 doc.additional_data = additional_data
 
+            # Record file size and quick-check fingerprint
+            if fingerprint is not None:
+                DocumentService._record_fingerprint(doc, fingerprint)
+            elif Path(file_path).is_file():
+                DocumentService._record_fingerprint(doc, DocumentService._fast_fingerprint(file_path))
+
             session.add(doc)
             session.flush()
             logger.info(f"Created document: {filename} (ID: {doc.id})")
@@ -121,8 +293,9 @@ class DocumentService:
         """
         Get existing document or create new one.
 
-        Checks if document with same file hash already exists in project.
-        If found and hash matches, returns existing document.
+        Checks if document with same filename already exists in project.
+        If found and its size and sampled fingerprint are unchanged, or its
+        full hash matches, returns existing document.
         If hash differs, updates the document.
 
         Args:
@@ -135,35 +308,33 @@ class DocumentService:
             tuple: (Document, is_new) where is_new indicates if document was created
         """
         def _get_or_create(session: Session) -> Tuple[Document, bool]:
-            # Calculate current file hash
-            current_hash = DocumentService.calculate_file_hash(file_path)
-
             # Check if document exists by filename
             existing_doc = session.query(Document).filter(
                 Document.project_id == project_id,
                 Document.filename == filename
             ).first()
 
+            fingerprint = DocumentService._fast_fingerprint(file_path)
+            if existing_doc and DocumentService._fingerprint_matches(existing_doc, fingerprint):
+                logger.info(f"Document {filename} unchanged (fingerprint match)")
+                return existing_doc, False
+
+            # Calculate current file hash
+            current_hash = DocumentService.calculate_file_hash(file_path)
+
             if existing_doc:
                 # Check if file has changed
-                if existing_doc.file_hash == current_hash:
+                if DocumentService._hash_matches(existing_doc.file_hash, current_hash, file_path):
                     logger.info(f"Document {filename} unchanged (hash match)")
+                    # Upgrade a legacy MD5 digest and refresh the fingerprint
+                    existing_doc.file_hash = current_hash
+                    DocumentService._record_fingerprint(existing_doc, fingerprint)
+                    session.flush()
                     return existing_doc, False
                 else:
                     # File changed - update hash and reset status
                     logger.info(f"Document {filename} changed (hash mismatch)")
-                    existing_doc.file_hash = current_hash
-                    existing_doc.file_path = file_path
-                    existing_doc.processing_status = ProcessingStatus.PENDING
-                    existing_doc.processed_at = None
-                    existing_doc.updated_at = datetime.now()
-
-                    # Update file size
-                    try:
-                        existing_doc.file_size_bytes = Path(file_path).stat().st_size
-                    except Exception:
-                        pass
-
+                    DocumentService._mark_changed(existing_doc, file_path, current_hash, fingerprint)
                     session.flush()
                     return existing_doc, False
 
@@ -173,6 +344,7 @@ class DocumentService:
                 filename=filename,
                 file_path=file_path,
                 file_hash=current_hash,
+                fingerprint=fingerprint,
                 session=session
             )
             return doc, True
@@ -187,6 +359,146 @@ class DocumentService:
             logger.error(f"Failed to get or create document '{filename}': {e}")
             return None, False
 
+    @staticmethod
+    def sync_folder(
+        project_id: int,
+        files: List[Tuple[str, str]],
+        session: Optional[Session] = None
+    ) -> Dict[str, Tuple[Optional[Document], bool]]:
+        """
+        Get or create the documents for a whole batch of files at once.
+
+        Bulk counterpart of get_or_create_document: existing documents are
+        loaded with one query instead of one per file, and changed and new
+        documents are written in a single flush.
+
+        Args:
+            project_id: Project ID
+            files: List of (filename, file_path) pairs, where filename is the
+                document's name within the project (unique per PDF, e.g. its
+                path relative to the input folder); the last path wins for a
+                repeated filename
+            session: Database session (optional)
+
+        Returns:
+            dict: filename -> (Document, is_new) as from get_or_create_document.
+                  Unreadable files and files whose content duplicates another
+                  document of the project map to (None, False).
+        """
+        paths = dict(files)
+
+        def _sync(session: Session) -> Dict[str, Tuple[Optional[Document], bool]]:
+            filenames = list(paths)
+            existing = {}
+            for start in range(0, len(filenames), BATCH_INSERT_SIZE):
+                existing.update((doc.filename, doc) for doc in session.scalars(
+                    select(Document).where(
+                        Document.project_id == project_id,
+                        Document.filename.in_(filenames[start:start + BATCH_INSERT_SIZE])
+                    )
+                ))
+
+            # Files are read in worker threads; ORM objects stay in this thread
+            results = {}
+            fingerprints = dict(zip(filenames, DocumentService._map_files(
+                DocumentService._fast_fingerprint, list(paths.values()))))
+            to_hash = []
+            for filename, fingerprint in fingerprints.items():
+                doc = existing.get(filename)
+                if doc is not None and DocumentService._fingerprint_matches(doc, fingerprint):
+                    results[filename] = (doc, False)
+                else:
+                    to_hash.append(filename)
+            current_hashes = DocumentService._map_files(
+                DocumentService.calculate_file_hash, [paths[filename] for filename in to_hash])
+
+            to_write = {}  # filename -> (current_hash, fingerprint)
+            for filename, current_hash in zip(to_hash, current_hashes):
+                doc = existing.get(filename)
+                file_path = paths[filename]
+                fingerprint = fingerprints[filename]
+                if not current_hash:
+                    results[filename] = (None, False)
+                elif doc is not None and DocumentService._hash_matches(doc.file_hash, current_hash, file_path):
+                    # Upgrade a legacy MD5 digest and refresh the fingerprint
+                    doc.file_hash = current_hash
+                    DocumentService._record_fingerprint(doc, fingerprint)
+                    results[filename] = (doc, False)
+                else:
+                    to_write[filename] = (current_hash, fingerprint)
+
+            # A project holds each file content once (uix_project_file_hash)
+            taken = {}
+            hashes = list({current_hash for current_hash, _ in to_write.values()})
+            for start in range(0, len(hashes), BATCH_INSERT_SIZE):
+                taken.update((file_hash, filename) for filename, file_hash in session.execute(
+                    select(Document.filename, Document.file_hash).where(
+                        Document.project_id == project_id,
+                        Document.file_hash.in_(hashes[start:start + BATCH_INSERT_SIZE])
+                    )
+                ))
+
+            # Rows from older versions hold MD5 digests the lookup above cannot match;
+            # compare them with the MD5 of the files to write, if the project has any
+            legacy = {}
+            if to_write:
+                legacy.update((file_hash, filename) for filename, file_hash in session.execute(
+                    select(Document.filename, Document.file_hash).where(
+                        Document.project_id == project_id,
+                        func.length(Document.file_hash).in_(_LEGACY_MD5_STORED_LENGTHS)
+                    )
+                ))
+            if legacy:
+                legacy_hashes = DocumentService._map_files(
+                    DocumentService._legacy_hash, [paths[filename] for filename in to_write])
+                for (current_hash, _), legacy_hash in zip(to_write.values(), legacy_hashes):
+                    if legacy_hash in legacy:
+                        taken.setdefault(current_hash, legacy[legacy_hash])
+
+            new_docs = []
+            changed = 0
+            for filename, (current_hash, fingerprint) in to_write.items():
+                if taken.setdefault(current_hash, filename) != filename:
+                    logger.warning(f"Document {filename} duplicates {taken[current_hash]} - skipped")
+                    results[filename] = (None, False)
+                    continue
+
+                file_path = paths[filename]
+                doc = existing.get(filename)
+                if doc is not None:
+                    DocumentService._mark_changed(doc, file_path, current_hash, fingerprint)
+                    results[filename] = (doc, False)
+                    changed += 1
+                else:
+                    doc = Document(
+                        project_id=project_id,
+                        filename=filename,
+                        file_path=file_path,
+                        file_hash=current_hash,
+                        processing_status=ProcessingStatus.PENDING
+                    )
+                    DocumentService._record_fingerprint(doc, fingerprint)
+                    new_docs.append(doc)
+                    results[filename] = (doc, True)
+
+            session.add_all(new_docs)
+            session.flush()
+            logger.info(
+                f"Synced {len(paths)} documents for project {project_id}: "
+                f"{len(new_docs)} new, {changed} changed"
+            )
+            return results
+
+        try:
+            if session:
+                return _sync(session)
+            else:
+                with DatabaseSession() as session:
+                    return _sync(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to sync documents for project {project_id}: {e}")
+            return {}
+
     @staticmethod
     def update_processing_status(
         document_id: int,
@@ -300,6 +612,10 @@ class DocumentService:
         Returns True if:
         - Document doesn't exist in database
         - Document exists but file hash changed
+        - Document previously failed
+
+        The full file hash is only calculated when the file size or sampled
+        fingerprint differs from the recorded one.
 
         Args:
             project_id: Project ID
@@ -311,9 +627,6 @@ class DocumentService:
             bool: True if document should be processed
         """
         def _should_process(session: Session) -> bool:
-            # Calculate current hash
-            current_hash = DocumentService.calculate_file_hash(file_path)
-
             # Check if document exists
             existing_doc = session.query(Document).filter(
                 Document.project_id == project_id,
@@ -324,14 +637,17 @@ class DocumentService:
                 logger.info(f"Document {filename} is new - should process")
                 return True
 
-            if existing_doc.file_hash != current_hash:
-                logger.info(f"Document {filename} has changed - should process")
-                return True
-
             if existing_doc.processing_status == ProcessingStatus.FAILED:
                 logger.info(f"Document {filename} previously failed - should reprocess")
                 return True
 
+            fingerprint = DocumentService._fast_fingerprint(file_path)
+            if not DocumentService._fingerprint_matches(existing_doc, fingerprint):
+                current_hash = DocumentService.calculate_file_hash(file_path)
+                if not DocumentService._hash_matches(existing_doc.file_hash, current_hash, file_path):
+                    logger.info(f"Document {filename} has changed - should process")
+                    return True
+
             logger.info(f"Document {filename} unchanged - skip processing")
             return False
 
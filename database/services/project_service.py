@@ -9,10 +9,11 @@ import logging
 from typing import List, Optional
 from datetime import datetime
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from database.models import Project
+from database.models import Document, ProcessingSession, Project, Requirement
 from database.database import DatabaseSession
 
 logger = logging.getLogger(__name__)
@@ -198,7 +199,7 @@ class ProjectService:
         def _get_all(session: Session) -> List[Project]:
             query = session.query(Project)
             if active_only:
-                query = query.filter(Project.is_active is True)
+                query = query.filter(Project.is_active.is_(True))
             return query.order_by(Project.created_at.desc()).all()
 
         try:
@@ -351,12 +352,17 @@ class ProjectService:
             if not project:
                 return None
 
+            # Count in SQL instead of loading every child row through the relationships
+            def _count(model) -> int:
+                return session.scalar(
+                    select(func.count()).select_from(model).where(model.project_id == project_id))
+
             stats = {
                 'project_id': project.id,
                 'project_name': project.name,
-                'document_count': len(project.documents),
-                'requirement_count': len(project.requirements),
-                'processing_session_count': len(project.processing_sessions),
+                'document_count': _count(Document),
+                'requirement_count': _count(Requirement),
+                'processing_session_count': _count(ProcessingSession),
                 'created_at': project.created_at.isoformat() if project.created_at else None,
                 'updated_at': project.updated_at.isoformat() if project.updated_at else None,
                 'is_active': project.is_active
@@ -6,18 +6,51 @@ version history tracking, and quality analysis.
 """
 
 import logging
-from typing import List, Optional, Dict
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
+from sqlalchemy import func, insert, select, true, update
 
+from config.database_config import BATCH_INSERT_SIZE, STREAM_CHUNK_SIZE
 from database.models import Requirement, RequirementHistory, Priority, ChangeType
 from database.database import DatabaseSession
 
 logger = logging.getLogger(__name__)
 
+# Values filled in for optional columns so every row of a bulk insert has the same keys
+_BULK_REQUIREMENT_DEFAULTS = {
+    'keyword': None,
+    'priority': None,
+    'category': None,
+    'confidence_score': None,
+    'raw_text': None,
+    'extraction_method': 'spacy_nlp',
+    'version': 1,
+    'is_current': True,
+}
+
+# Bulk insert statements, built once. They run as plain Core statements on the
+# session's connection, skipping the per-row mapping of ORM-enabled bulk inserts.
+_INSERT_REQUIREMENTS = insert(Requirement.__table__).returning(
+    Requirement.__table__.c.id, sort_by_parameter_order=True)
+# Unordered RETURNING can be batched on every dialect (SQLite has no insert sentinel
+# for ordered batches); rows are matched back by their unique key
+_INSERT_REQUIREMENTS_KEYED = insert(Requirement.__table__).returning(
+    Requirement.__table__.c.id, Requirement.__table__.c.document_id, Requirement.__table__.c.label_number)
+_INSERT_HISTORY = insert(RequirementHistory.__table__)
+
+# Requirement fields captured in each history snapshot
+_SNAPSHOT_FIELDS = (
+    'label_number', 'description', 'page_number', 'keyword', 'priority', 'category',
+    'confidence_score', 'raw_text', 'extraction_method', 'additional_data',
+)
+# Deferred Requirement columns; creation paths snapshot them from the input values,
+# since reading them from a freshly inserted object costs one SELECT per row
+_DETAIL_FIELDS = ('raw_text', 'additional_data')
+
 
 class RequirementService:
     """Service class for Requirement-related operations."""
@@ -87,7 +120,8 @@ class RequirementService:
                 session=session,
                 requirement=req,
                 change_type=ChangeType.CREATED,
-                change_description='Initial extraction'
+                change_description='Initial extraction',
+                detail_values={'raw_text': raw_text, 'additional_data': additional_data or None}
             )
 
             logger.info(f"Created requirement: {label_number} (ID: {req.id})")
@@ -128,14 +162,14 @@ class RequirementService:
 
             session.flush()
 
-            # Create history records for all
-            for req in requirements:
-                RequirementService._create_history_record(
-                    session=session,
-                    requirement=req,
-                    change_type=ChangeType.CREATED,
-                    change_description='Initial extraction'
-                )
+            # Create history records for all in one executemany
+            if requirements:
+                session.execute(insert(RequirementHistory), [
+                    RequirementService._history_values(
+                        req.id, RequirementService._snapshot_values(req, req_data),
+                        ChangeType.CREATED, 'Initial extraction')
+                    for req, req_data in zip(requirements, requirements_data)
+                ])
 
             logger.info(f"Bulk created {len(requirements)} requirements")
             return requirements
@@ -150,13 +184,141 @@ class RequirementService:
             logger.error(f"Failed to bulk create requirements: {e}")
             return []
 
+    @staticmethod
+    def bulk_create(
+        requirements_data: List[dict],
+        replace_current: bool = False,
+        session: Optional[Session] = None
+    ) -> int:
+        """
+        Insert requirements and their initial history records without building ORM objects.
+
+        Rows are sent in batches of BATCH_INSERT_SIZE as executemany INSERTs, which
+        SQLAlchemy renders as multi-row VALUES statements; the new requirement IDs
+        come back through RETURNING to link the history records.
+
+        Args:
+            requirements_data: List of dicts with requirement column values
+                (all rows must provide the same keys)
+            replace_current: Mark the existing current requirements of the affected
+                documents as no longer current first (e.g. when a document is re-processed)
+            session: Database session (optional)
+
+        Returns:
+            int: Number of requirements inserted (0 if failed)
+        """
+        def _bulk_create(session: Session) -> int:
+            rows_iter = iter(requirements_data)
+            count = 0
+
+            if replace_current:
+                document_ids = {row['document_id'] for row in requirements_data}
+                session.execute(
+                    update(Requirement)
+                    .where(Requirement.document_id.in_(document_ids), Requirement.is_current == true())
+                    .values(is_current=False)
+                    .execution_options(synchronize_session=False)
+                )
+
+            # Flushes pending ORM changes once; the Core statements below never autoflush
+            connection = session.connection()
+            while True:
+                batch = [{**_BULK_REQUIREMENT_DEFAULTS, **row} for row in islice(rows_iter, BATCH_INSERT_SIZE)]
+                if not batch:
+                    break
+
+                keys = [(row['document_id'], row['label_number']) for row in batch]
+                if all(row['is_current'] for row in batch) and len(set(keys)) == len(keys):
+                    # Current labels are unique per document (uix_req_current_label)
+                    returned = connection.execute(_INSERT_REQUIREMENTS_KEYED, batch)
+                    ids_by_key = {(document_id, label): id_ for id_, document_id, label in returned}
+                    requirement_ids = [ids_by_key[key] for key in keys]
+                else:
+                    requirement_ids = connection.execute(_INSERT_REQUIREMENTS, batch).scalars().all()
+                connection.execute(_INSERT_HISTORY, [
+                    RequirementService._history_values(
+                        requirement_id, row, ChangeType.CREATED, 'Initial extraction')
+                    for requirement_id, row in zip(requirement_ids, batch)
+                ])
+                count += len(batch)
+
+            logger.info(f"Bulk inserted {count} requirements")
+            return count
+
+        try:
+            if session:
+                return _bulk_create(session)
+            else:
+                with DatabaseSession() as session:
+                    return _bulk_create(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to bulk insert requirements: {e}")
+            return 0
+
+    @staticmethod
+    def _history_values(
+        requirement_id: int,
+        values: Dict,
+        change_type: ChangeType,
+        change_description: Optional[str] = None,
+        changed_by: Optional[str] = None
+    ) -> Dict:
+        """
+        Build the column values of a history record from a requirement's values.
+
+        Args:
+            requirement_id: ID of the requirement
+            values: Requirement column values (version plus the snapshot fields)
+            change_type: Type of change (ChangeType enum)
+            change_description: Description of change (optional)
+            changed_by: User who made the change (optional)
+
+        Returns:
+            Dict: Values for a RequirementHistory row
+        """
+        return {
+            'requirement_id': requirement_id,
+            'version': values['version'],
+            'description': values['description'],
+            'priority': values.get('priority'),
+            'category': values.get('category'),
+            'confidence_score': values.get('confidence_score'),
+            'change_type': change_type,
+            'change_description': change_description,
+            'changed_by': changed_by,
+            'snapshot_data': {field: values.get(field) for field in _SNAPSHOT_FIELDS}
+        }
+
+    @staticmethod
+    def _snapshot_values(requirement: Requirement, detail_values: Optional[Dict] = None) -> Dict:
+        """
+        Collect the version and snapshot fields of a requirement.
+
+        Args:
+            requirement: Requirement object
+            detail_values: Values the deferred detail columns were created with;
+                when given they are used instead of loading the columns
+
+        Returns:
+            Dict: Field name -> value
+        """
+        if detail_values is None:
+            return {field: getattr(requirement, field) for field in ('version',) + _SNAPSHOT_FIELDS}
+        values = {
+            field: getattr(requirement, field)
+            for field in ('version',) + _SNAPSHOT_FIELDS if field not in _DETAIL_FIELDS
+        }
+        values.update((field, detail_values.get(field)) for field in _DETAIL_FIELDS)
+        return values
+
     @staticmethod
     def _create_history_record(
         session: Session,
         requirement: Requirement,
         change_type: ChangeType,
         change_description: Optional[str] = None,
-        changed_by: Optional[str] = None
+        changed_by: Optional[str] = None,
+        detail_values: Optional[Dict] = None
     ) -> RequirementHistory:
         """
         Create a history record for a requirement.
@@ -167,36 +329,15 @@ class RequirementService:
             change_type: Type of change (ChangeType enum)
             change_description: Description of change (optional)
             changed_by: User who made the change (optional)
+            detail_values: Input values of the deferred columns, for newly created requirements
 
         Returns:
             RequirementHistory: Created history record
         """
         # Create snapshot of current state
-        snapshot_data = {
-            'label_number': requirement.label_number,
-            'description': requirement.description,
-            'page_number': requirement.page_number,
-            'keyword': requirement.keyword,
-            'priority': requirement.priority,
-            'category': requirement.category,
-            'confidence_score': requirement.confidence_score,
-            'raw_text': requirement.raw_text,
-            'extraction_method': requirement.extraction_method,
-            'additional_data': requirement.additional_data
-        }
-
-        history = RequirementHistory(
-            requirement_id=requirement.id,
-            version=requirement.version,
-            description=requirement.description,
-            priority=requirement.priority,
-            category=requirement.category,
-            confidence_score=requirement.confidence_score,
-            change_type=change_type,
-            change_description=change_description,
-            changed_by=changed_by,
-            snapshot_data=snapshot_data
-        )
+        values = RequirementService._snapshot_values(requirement, detail_values)
+        history = RequirementHistory(**RequirementService._history_values(
+            requirement.id, values, change_type, change_description, changed_by))
 
         session.add(history)
         return history
@@ -263,6 +404,84 @@ class RequirementService:
             logger.error(f"Failed to get requirements for project {project_id}: {e}")
             return []
 
+    @staticmethod
+    def stream_requirements(
+        project_id: int,
+        current_only: bool = True,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        session: Optional[Session] = None
+    ) -> Iterator[Requirement]:
+        """
+        Iterate over the requirements of a project without loading them all at once.
+
+        Rows are fetched chunk_size at a time (a server-side cursor on PostgreSQL),
+        so memory stays bounded for large projects. Prefer this over
+        Project.requirements or get_requirements_by_project() for exports.
+
+        Unlike the list-returning getters, database errors are logged and re-raised
+        so a consumer cannot mistake a failed stream for a short one.
+
+        Args:
+            project_id: Project ID
+            current_only: Only yield current requirement versions
+            chunk_size: Number of rows buffered per fetch
+            session: Database session (optional, kept open until iteration ends)
+
+        Yields:
+            Requirement: Requirements ordered by label number
+        """
+        stmt = select(Requirement).where(Requirement.project_id == project_id)
+        if current_only:
+            stmt = stmt.where(Requirement.is_current == true())
+        stmt = stmt.order_by(Requirement.label_number).execution_options(yield_per=chunk_size)
+
+        try:
+            if session:
+                yield from session.scalars(stmt)
+            else:
+                with DatabaseSession() as session:
+                    yield from session.scalars(stmt)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to stream requirements for project {project_id}: {e}")
+            raise
+
+    @staticmethod
+    def get_requirements_for_report(
+        project_id: int,
+        session: Optional[Session] = None
+    ) -> List[Requirement]:
+        """
+        Get the current requirements of a project for reporting.
+
+        The source document is joined in and the version history is fetched with
+        one extra IN query, so iterating over the result issues no further SQL.
+
+        Args:
+            project_id: Project ID
+            session: Database session (optional)
+
+        Returns:
+            List[Requirement]: Requirements ordered by document, page and label
+        """
+        def _get(session: Session) -> List[Requirement]:
+            stmt = (
+                select(Requirement)
+                .where(Requirement.project_id == project_id, Requirement.is_current == true())
+                .options(joinedload(Requirement.document), selectinload(Requirement.history))
+                .order_by(Requirement.document_id, Requirement.page_number, Requirement.label_number)
+            )
+            return list(session.scalars(stmt))
+
+        try:
+            if session:
+                return _get(session)
+            else:
+                with DatabaseSession() as session:
+                    return _get(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get report requirements for project {project_id}: {e}")
+            return []
+
     @staticmethod
     def filter_requirements(
         project_id: Optional[int] = None,
@@ -434,6 +653,56 @@ class RequirementService:
             logger.error(f"Failed to get history for requirement {requirement_id}: {e}")
             return []
 
+    @staticmethod
+    def get_requirement_lineage(
+        requirement_id: int,
+        session: Optional[Session] = None
+    ) -> List[Requirement]:
+        """
+        Get every requirement in the same parent_requirement chain as the given one.
+
+        The chain is resolved in a single statement with recursive CTEs: up to
+        the root version, then down through all derived versions.
+
+        Args:
+            requirement_id: ID of any requirement in the chain
+            session: Database session (optional)
+
+        Returns:
+            List[Requirement]: Requirements ordered by version (empty if not found)
+        """
+        def _get_lineage(session: Session) -> List[Requirement]:
+            ancestors = select(Requirement.id, Requirement.parent_requirement_id).where(
+                Requirement.id == requirement_id
+            ).cte('ancestors', recursive=True)
+            ancestors = ancestors.union_all(
+                select(Requirement.id, Requirement.parent_requirement_id).join(
+                    ancestors, Requirement.id == ancestors.c.parent_requirement_id)
+            )
+            root_id = select(ancestors.c.id).where(
+                ancestors.c.parent_requirement_id.is_(None)
+            ).scalar_subquery()
+
+            lineage = select(Requirement.id).where(Requirement.id == root_id).cte('lineage', recursive=True)
+            lineage = lineage.union_all(
+                select(Requirement.id).join(lineage, Requirement.parent_requirement_id == lineage.c.id)
+            )
+
+            stmt = select(Requirement).where(
+                Requirement.id.in_(select(lineage.c.id))
+            ).order_by(Requirement.version, Requirement.id)
+            return list(session.scalars(stmt))
+
+        try:
+            if session:
+                return _get_lineage(session)
+            else:
+                with DatabaseSession() as session:
+                    return _get_lineage(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get lineage for requirement {requirement_id}: {e}")
+            return []
+
     @staticmethod
     def get_quality_statistics(
         project_id: int,
@@ -508,6 +777,44 @@ class RequirementService:
             logger.error(f"Failed to get quality statistics for project {project_id}: {e}")
             return None
 
+    @staticmethod
+    def get_confidence_histogram(
+        project_id: int,
+        session: Optional[Session] = None
+    ) -> Dict[int, int]:
+        """
+        Count the current requirements of a project per confidence decile.
+
+        Args:
+            project_id: Project ID
+            session: Database session (optional)
+
+        Returns:
+            Dict[int, int]: Requirement count keyed by decile (0 = 0.0-0.1, ..., 10 = 1.0);
+                requirements without a confidence score are left out
+        """
+        def _get_histogram(session: Session) -> Dict[int, int]:
+            bucket_counts = session.query(
+                Requirement.confidence_bucket,
+                func.count()
+            ).filter(
+                Requirement.project_id == project_id,
+                Requirement.is_current == true(),
+                Requirement.confidence_bucket.is_not(None)
+            ).group_by(Requirement.confidence_bucket).all()
+
+            return {bucket: count for bucket, count in bucket_counts}
+
+        try:
+            if session:
+                return _get_histogram(session)
+            else:
+                with DatabaseSession() as session:
+                    return _get_histogram(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get confidence histogram for project {project_id}: {e}")
+            return {}
+
     @staticmethod
     def search_requirements(
         search_text: str,
@@ -1,13 +1,69 @@
 import os
+from io import BytesIO
 from openpyxl import load_workbook, Workbook  # Import Workbook
 from openpyxl.styles import PatternFill
 from openpyxl.styles.colors import Color
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, column_index_from_string
 from openpyxl.worksheet.datavalidation import DataValidation
 import pandas as pd  # You'll need pandas to create a DataFrame easily
 
-
-def write_excel_file(df, excel_file):
+# Optional: xlsxwriter streams rows straight to disk and is much faster than openpyxl
+# for large matrices, but it cannot open the template (see write_excel_file_xlsxwriter)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    xlsxwriter = None
+    XLSXWRITER_AVAILABLE = False
+
+# Compliance matrix engine: 'openpyxl' (default, fills the template in place) or 'xlsxwriter'
+EXCEL_ENGINE = os.getenv('REQBOT_EXCEL_ENGINE', 'openpyxl').lower()
+
+# Spare rows below the written requirements that keep the dropdown validations,
+# so users can add a few requirements by hand without re-running ReqBot.
+VALIDATION_EXTRA_ROWS = 1000
+
+# Dropdown data validations applied from row 5: (column, allowed values)
+# NOTE: All columns shifted right by 1 due to Confidence column in E
+DATA_VALIDATIONS = [
+    ('J', ['Technical', 'Procedure', 'Legal', 'SW', 'HW', 'Safety', 'Documentation', 'Safety', 'Warning', 'N.A.']),
+    ('K', ['Machine', 'Product', 'Company']),
+    ('L', ['Concept', 'UTM', 'UTS', 'UTE', 'SW', 'Testing', 'Process', 'Assembly', 'Logistic', 'Quality', 'PM',
+           'Purchasing', 'Sales', 'Service']),
+    ('N', ['Approved', 'Rejected', 'In discussion', 'Acquired']),
+    ('O', ['yes', 'partially', 'no']),
+    ('P', ['easy', 'medium', 'hard']),
+    ('V', ['completed', 'on going', 'blocked', 'failed']),
+    ('X', ['compliant', 'not compliant', 'partially compliant']),
+]
+
+# Compliance score formula (column Q)
+# NOTE: All columns shifted right by 1 due to Confidence column in E
+_COL_I = 'I'  # Priority (column 9 - shifted from H)
+_COL_N = 'N'  # Status (column 14 - shifted from M)
+_COL_O = 'O'  # Completeness (column 15 - shifted from N)
+_COL_P = 'P'  # Difficulty (column 16 - shifted from O)
+COL_Q_IDX = 17  # Q (Output column for formula - shifted from P)
+
+# Built once at import; only the row number changes per row.
+# Each text column is scored with a single MATCH against an inline array instead
+# of a nested IF cascade, so Excel evaluates one lookup per input on recalc.
+# MATCH returns the 1-based position (e.g. low=1, medium=2, high=3) and IFERROR
+# maps blank/unknown entries to 0, which keeps the original weights intact.
+# Status is 1 for Approved/In discussion/Acquired and 0 for anything else.
+# '%(row)d' is the row placeholder; '{{'/'}}' are literal Excel array braces.
+COMPLIANCE_FORMULA_TEMPLATE = (
+    f'=ROUND((('
+    f'IFERROR(MATCH({_COL_I}%(row)d, {{"low","medium","high"}}, 0), 0) * 4/3 + '  # Priority
+    f'IFERROR(MATCH({_COL_O}%(row)d, {{"yes","partially","no"}}, 0), 0) * 3/3 + '  # Completeness
+    f'IFERROR(MATCH({_COL_P}%(row)d, {{"easy","medium","hard"}}, 0), 0) * 2/3'  # Difficulty
+    f') - 3) * '
+    f'ISNUMBER(MATCH({_COL_N}%(row)d, {{"Approved","In discussion","Acquired"}}, 0))'  # Status
+    f', 2)'
+)
+
+
+def write_excel_file(df, excel_file, template_bytes=None):
     """
     Loads an Excel workbook, updates a specific sheet with data from a DataFrame,
     applies conditional formatting based on priority and confidence, adds data validations,
@@ -17,11 +73,24 @@ def write_excel_file(df, excel_file):
         df (pandas.DataFrame): The DataFrame containing data to write.
                                Expected columns: 'Page', 'Label Number', 'Description', 'Priority', 'Confidence', 'Category'.
                                The DataFrame index is used for 'A' column.
-        excel_file (str): The path to the existing Excel file to be updated.
+        excel_file (str): The path to the Excel file to be updated. When template_bytes is
+                          given, the file does not need to exist and is created on save.
+        template_bytes (bytes, optional): In-memory content of the compliance matrix template.
+                                          If provided, the workbook is loaded from these bytes
+                                          instead of from excel_file.
+
+    Note:
+        openpyxl's write-only (streaming) mode is deliberately not used: it can only create
+        new workbooks, while the compliance matrix must keep the template's styled header
+        rows and its other sheets (e.g. 'HEADING', 'Menu'). Memory use is instead kept down by
+        only touching the data rows and bounding the data validation ranges.
     """
     try:
         # Carica il workbook e accedi al foglio di lavoro da aggiornare
-        book = load_workbook(excel_file)
+        if template_bytes is not None:
+            book = load_workbook(BytesIO(template_bytes))
+        else:
+            book = load_workbook(excel_file)
         # Ensure the sheet exists, otherwise this will raise a KeyError
         if 'MACHINE COMP. MATRIX' not in book.sheetnames:
             print(f"Error: Sheet 'MACHINE COMP. MATRIX' not found in {excel_file}")
@@ -34,6 +103,7 @@ def write_excel_file(df, excel_file):
         fill_medium = PatternFill(start_color=Color(rgb='00FFFF00'),
                                   end_color=Color(rgb='00FFFF00'), fill_type='solid')  # Yellow
         fill_low = PatternFill(start_color=Color(rgb='0000FF00'), end_color=Color(rgb='0000FF00'), fill_type='solid')  # Green
+        fill_by_priority = {'high': fill_high, 'medium': fill_medium, 'low': fill_low}
 
         # Confidence color fills (for column E)
         # High confidence: Green (≥0.8), Medium: Yellow (0.6-0.8), Low: Red (<0.6)
@@ -46,114 +116,66 @@ def write_excel_file(df, excel_file):
 
         # Update the Compliance Matrix with the requirements
         # Starting from row 5
-        for i, (value1, value2, value3, value4, value5, value6, value7) in enumerate(
-                zip(df.index, df['Page'], df['Label Number'], df['Description'], df['Priority'], df['Confidence'], df['Category']), start=5):  # noqa: E501
-
-            writer[f'A{i}'] = value1         # df.index
-            writer[f'B{i}'] = value2         # Page
-            writer[f'C{i}'] = value3         # Label Number
-            writer[f'D{i}'] = value4         # Description
-            writer[f'E{i}'] = value6         # Confidence (NEW)
-            writer[f'I{i}'] = value5         # Priority (SHIFTED from H to I due to Confidence)
-            writer[f'J{i}'] = value7         # Category (v2.2)
+        # Select the written columns once and iterate plain tuples; indexing df['...']
+        # per column and zipping the Series boxes every value through pandas.
+        rows = df[['Page', 'Label Number', 'Description', 'Priority', 'Confidence', 'Category']].itertuples(
+            index=True, name=None)
+        for i, (value1, value2, value3, value4, value5, value6, value7) in enumerate(rows, start=5):
+
+            # Address cells by (row, column) instead of 'A5'-style strings so openpyxl
+            # does not re-parse a coordinate on every write.
+            writer.cell(row=i, column=1, value=value1)             # df.index
+            writer.cell(row=i, column=2, value=value2)             # Page
+            writer.cell(row=i, column=3, value=value3)             # Label Number
+            writer.cell(row=i, column=4, value=value4)             # Description
+            conf_cell = writer.cell(row=i, column=5, value=value6)  # Confidence (NEW)
+            prio_cell = writer.cell(row=i, column=9, value=value5)  # Priority (SHIFTED from H to I due to Confidence)
+            writer.cell(row=i, column=10, value=value7)            # Category (v2.2)
 
             # Apply fill based on priority (column I - shifted from H)
-            priority = str(value5).lower()  # Ensure priority is string and lowercase for comparison
-            if priority == 'high':
-                writer[f'I{i}'].fill = fill_high
-            elif priority == 'medium':
-                writer[f'I{i}'].fill = fill_medium
-            elif priority == 'low':
-                writer[f'I{i}'].fill = fill_low
+            # Ensure priority is string and lowercase for the lookup; other priorities stay unfilled
+            priority_fill = fill_by_priority.get(str(value5).lower())
+            if priority_fill is not None:
+                prio_cell.fill = priority_fill
 
             # Apply fill based on confidence (column E)
             # Format confidence as percentage and apply color coding
             try:
                 confidence_value = float(value6)
-                writer[f'E{i}'].number_format = '0.00'  # Format as decimal
+                conf_cell.number_format = '0.00'  # Format as decimal
 
                 if confidence_value >= 0.8:
-                    writer[f'E{i}'].fill = fill_conf_high  # Green for high confidence
+                    conf_cell.fill = fill_conf_high  # Green for high confidence
                 elif confidence_value >= 0.6:
-                    writer[f'E{i}'].fill = fill_conf_medium  # Yellow for medium confidence
+                    conf_cell.fill = fill_conf_medium  # Yellow for medium confidence
                 else:
-                    writer[f'E{i}'].fill = fill_conf_low  # Red for low confidence
+                    conf_cell.fill = fill_conf_low  # Red for low confidence
             except (ValueError, TypeError):
                 # If confidence is not a valid number, skip formatting
                 pass
 
+            # Compliance score formula, written in the same pass as the row data
+            formula_cell = writer.cell(row=i, column=COL_Q_IDX)
+            formula_cell.value = COMPLIANCE_FORMULA_TEMPLATE % {'row': i}  # Insert the formula
+            formula_cell.number_format = '0'  # Ensure it's formatted as a number
+
         # Aggiungi qui le definizioni della Data Validation
-        # NOTE: All columns shifted right by 1 due to Confidence column in E
-        # Max row for Excel is 1048576, using this for full column validation
-        dv1 = DataValidation(type="list",
-                             formula1='"Technical,Procedure,Legal,SW,HW,Safety,Documentation,Safety,Warning,N.A."',
-                             allow_blank=True)
-        dv1.add('J5:J1048576')  # Shifted from I to J
-
-        dv2 = DataValidation(type="list", formula1='"Machine,Product,Company"', allow_blank=True)
-        dv2.add('K5:K1048576')  # Shifted from J to K
-
-        dv3 = DataValidation(
-            type="list", formula1='"Concept,UTM,UTS,UTE,SW,Testing,Process,Assembly,Logistic,Quality,PM,Purchasing,Sales,Service"', allow_blank=True)  # noqa: E501
-        dv3.add('L5:L1048576')  # Shifted from K to L
-
-        dv4 = DataValidation(type="list", formula1='"Approved,Rejected,In discussion,Acquired"', allow_blank=True)
-        dv4.add('N5:N1048576')  # Shifted from M to N
-
-        dv5 = DataValidation(type="list", formula1='"yes,partially,no"', allow_blank=True)
-        dv5.add('O5:O1048576')  # Shifted from N to O
-
-        dv6 = DataValidation(type="list", formula1='"easy,medium,hard"', allow_blank=True)
-        dv6.add('P5:P1048576')  # Shifted from O to P
-
-        dv7 = DataValidation(type="list", formula1='"completed,on going,blocked,failed"', allow_blank=True)
-        dv7.add('V5:V1048576')  # Shifted from U to V
-
-        dv8 = DataValidation(type="list", formula1='"compliant,not compliant,partially compliant"', allow_blank=True)
-        dv8.add('X5:X1048576')  # Shifted from W to X
-
-        writer.add_data_validation(dv1)
-        writer.add_data_validation(dv2)
-        writer.add_data_validation(dv3)
-        writer.add_data_validation(dv4)
-        writer.add_data_validation(dv5)
-        writer.add_data_validation(dv6)
-        writer.add_data_validation(dv7)
-        writer.add_data_validation(dv8)
-
-        # Apply formulas
-        # NOTE: All columns shifted right by 1 due to Confidence column in E
-        for i in range(5, writer.max_row + 1):
-            col_i = get_column_letter(9)  # I (Priority - shifted from H)
-            col_n = get_column_letter(14)  # N (Status - shifted from M)
-            col_o = get_column_letter(15)  # O (Completeness - shifted from N)
-            col_p = get_column_letter(16)  # P (Difficulty - shifted from O)
-            col_q = get_column_letter(17)  # Q (Output column for formula - shifted from P)
-
-            # Construct the formula string. Be careful with double quotes inside
-            # the formula if they are part of string literals for Excel.
-            # Using single quotes for Python string and escaping double quotes for Excel string literals.
-            formula = (
-                f'=ROUND((('
-                f'(IF({col_i}{i}="high", 3, IF({col_i}{i}="medium", 2, IF({col_i}{i}="low", 1, 0))) * 4/3) + '  # Priority
-                f'(IF({col_o}{i}="yes", 1, IF({col_o}{i}="partially", 2, IF({col_o}{i}="no", 3, 0))) * 3/3) + '  # Completeness
-                f'(IF({col_p}{i}="hard", 3, IF({col_p}{i}="medium", 2, IF({col_p}{i}="easy", 1, 0))) * 2/3)'  # Difficulty
-                f') - 3) * '
-                f'IF({col_n}{i}="Approved", 1, IF({col_n}{i}="Rejected", 0, IF({col_n}{i}="In discussion", 1, IF({col_n}{i}="Acquired", 1, 0))))'  # noqa: E501
-                f'), 2)'
-            )
-
-            writer[f'{col_q}{i}'].value = None  # Clear existing value
-            writer[f'{col_q}{i}'].value = formula  # Insert the formula
-            writer[f'{col_q}{i}'].number_format = '0'  # Ensure it's formatted as a number
+        # Validations cover the written rows plus VALIDATION_EXTRA_ROWS spare rows instead of
+        # the full column (row 1048576), which bloated the sheet XML and slowed down saving.
+        last_validation_row = 4 + len(df) + VALIDATION_EXTRA_ROWS
+        for col, values in DATA_VALIDATIONS:
+            dv = DataValidation(type="list", formula1='"' + ','.join(values) + '"', allow_blank=True)
+            dv.add(f'{col}5:{col}{last_validation_row}')
+            writer.add_data_validation(dv)
 
         # Add auto-filter to allow filtering by confidence and other columns
         # Apply filter to row 4 (header row) - assumes headers are in row 4
-        if writer.max_row >= 4:
+        max_row = writer.max_row
+        if max_row >= 4:
             # Auto-filter from column A to the last used column
             last_col = get_column_letter(writer.max_column)
-            writer.auto_filter.ref = f'A4:{last_col}{writer.max_row}'
-            print(f"Auto-filter applied to range A4:{last_col}{writer.max_row}")
+            writer.auto_filter.ref = f'A4:{last_col}{max_row}'
+            print(f"Auto-filter applied to range A4:{last_col}{max_row}")
 
         # Salva il workbook
         book.save(excel_file)
@@ -165,6 +187,101 @@ def write_excel_file(df, excel_file):
         print(f"An error occurred: {e}")
 
 
+def write_excel_file_xlsxwriter(df, excel_file, template_bytes=None):
+    """
+    Writes the compliance matrix with xlsxwriter in constant-memory mode.
+
+    xlsxwriter streams each row to disk as it is written, which is much faster than
+    openpyxl and keeps memory flat for large matrices. It cannot open an existing
+    workbook, so the output contains only the 'MACHINE COMP. MATRIX' sheet: the values
+    of the template's header rows 1-4 are copied when template_bytes is given, while
+    template styles and other sheets are not. Data, fills, formulas, data validations
+    and the auto-filter match write_excel_file().
+
+    Selected with REQBOT_EXCEL_ENGINE=xlsxwriter (requires the xlsxwriter package).
+
+    Args:
+        df (pandas.DataFrame): The DataFrame containing data to write (same columns as write_excel_file).
+        excel_file (str): The path of the Excel file to create.
+        template_bytes (bytes, optional): In-memory content of the compliance matrix template,
+                                          used for the header rows.
+    """
+    if not XLSXWRITER_AVAILABLE:
+        print("Error: xlsxwriter is not installed. Install it or use the default openpyxl engine.")
+        return
+
+    try:
+        # Header rows (values only) from the template; read-only mode parses just these rows
+        header_rows = []
+        if template_bytes is not None:
+            template = load_workbook(BytesIO(template_bytes), read_only=True)
+            if 'MACHINE COMP. MATRIX' in template.sheetnames:
+                header_rows = list(template['MACHINE COMP. MATRIX'].iter_rows(min_row=1, max_row=4, values_only=True))
+            template.close()
+
+        # strings_to_formulas/urls off: descriptions are plain text, formulas are written explicitly
+        book = xlsxwriter.Workbook(excel_file, {'constant_memory': True,
+                                                'strings_to_formulas': False,
+                                                'strings_to_urls': False,
+                                                'nan_inf_to_errors': True})
+        try:
+            writer = book.add_worksheet('MACHINE COMP. MATRIX')
+
+            fill_by_priority = {'high': book.add_format({'bg_color': '#FF0000'}),
+                                'medium': book.add_format({'bg_color': '#FFFF00'}),
+                                'low': book.add_format({'bg_color': '#00FF00'})}
+            fmt_conf_high = book.add_format({'bg_color': '#00FF00', 'num_format': '0.00'})
+            fmt_conf_medium = book.add_format({'bg_color': '#FFFF00', 'num_format': '0.00'})
+            fmt_conf_low = book.add_format({'bg_color': '#FF0000', 'num_format': '0.00'})
+            fmt_formula = book.add_format({'num_format': '0'})
+
+            # Rows are 0-based in xlsxwriter and must be written top to bottom (constant_memory)
+            for r, values in enumerate(header_rows):
+                writer.write_row(r, 0, values)
+
+            rows = df[['Page', 'Label Number', 'Description', 'Priority', 'Confidence', 'Category']].itertuples(
+                index=True, name=None)
+            for i, (value1, value2, value3, value4, value5, value6, value7) in enumerate(rows, start=5):
+                r = i - 1
+                writer.write(r, 0, value1)  # df.index
+                writer.write(r, 1, value2)  # Page
+                writer.write(r, 2, value3)  # Label Number
+                writer.write(r, 3, value4)  # Description
+
+                try:
+                    confidence_value = float(value6)
+                    if confidence_value >= 0.8:
+                        writer.write(r, 4, value6, fmt_conf_high)
+                    elif confidence_value >= 0.6:
+                        writer.write(r, 4, value6, fmt_conf_medium)
+                    else:
+                        writer.write(r, 4, value6, fmt_conf_low)
+                except (ValueError, TypeError):
+                    writer.write(r, 4, value6)
+
+                writer.write(r, 8, value5, fill_by_priority.get(str(value5).lower()))  # Priority (I)
+                writer.write(r, 9, value7)  # Category (J)
+                writer.write_formula(r, COL_Q_IDX - 1, COMPLIANCE_FORMULA_TEMPLATE % {'row': i}, fmt_formula)
+
+            # Same dropdown validations and bounds as write_excel_file (0-based column indexes)
+            last_validation_row = 4 + len(df) + VALIDATION_EXTRA_ROWS
+            for col, values in DATA_VALIDATIONS:
+                col_idx = column_index_from_string(col) - 1
+                writer.data_validation(4, col_idx, last_validation_row - 1, col_idx,
+                                       {'validate': 'list', 'source': values, 'ignore_blank': True})
+
+            last_row = 4 + len(df)
+            last_col = max([len(values) for values in header_rows] + [COL_Q_IDX])
+            writer.autofilter(3, 0, last_row - 1, last_col - 1)
+            print(f"Auto-filter applied to range A4:{get_column_letter(last_col)}{last_row}")
+        finally:
+            book.close()
+        print(f"Excel file '{excel_file}' written successfully.")
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+
 if __name__ == '__main__':
     excel_template_path = "template_compliance_matrix.xlsx"
 
@@ -1,5 +1,6 @@
 import logging
 import os
+import multiprocessing
 import sys
 
 # --- PySide6 Imports ---
@@ -947,6 +948,9 @@ class RequirementBotApp(QWidget):
 
 
 if __name__ == '__main__':
+    # Processing runs PDFs in worker processes; required for frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     # Initial logging setup for main process (can be overridden by GUI handler)
     logging.basicConfig(filename='application_main.log', level=logging.ERROR,
                         format='%(asctime)s - %(levelname)s - %(message)s')
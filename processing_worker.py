@@ -1,10 +1,14 @@
 import os
 import logging
+import multiprocessing
+import time
 from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PySide6.QtCore import QObject, Signal
 
 # Assuming these are your core logic functions
-from RB_coordinator import requirement_bot
+from RB_coordinator import requirement_bot, persist_requirements, sync_documents
 from config_RB import load_keyword_config
 from get_all_files import get_all
 from report_generator import create_processing_report
@@ -22,6 +26,54 @@ except ImportError:
 # Set up logging for the worker
 worker_logger = logging.getLogger(__name__)
 
+# Minimum time between progress signals sent to the GUI (20 updates per second)
+PROGRESS_EMIT_INTERVAL = 0.05
+
+# Estimated manual analysis effort per requirement, in hours (5 minutes)
+HOURS_PER_REQUIREMENT = 5 / 60
+
+# LOG.txt entry written once per processed PDF
+LOG_ENTRY = (
+    "PDF Name: {name}\n"
+    "Number of Requirements: {n}\n"
+    "Average Confidence: {confidence}\n"
+    "Estimated time for manual analysis: {hours} hrs\n"
+    "Execution Time: {seconds} seconds\n\n"
+)
+
+
+def _run_one(file_path, cm_file, keywords, folder_output, confidence_threshold):
+    """
+    Process a single PDF in a worker process.
+
+    Runs the full requirement_bot pipeline (extraction, compliance matrix,
+    BASIL export, highlighted PDF) without database persistence: database
+    sessions cannot cross process boundaries, so the GUI-side worker saves
+    the returned DataFrame itself.
+
+    Args:
+        file_path: Path to the input PDF
+        cm_file: Path to the compliance matrix template
+        keywords: Set of keywords to find
+        folder_output: Output directory
+        confidence_threshold: Minimum confidence threshold for requirements
+
+    Returns:
+        tuple: (DataFrame or None, execution time in seconds, error message or None)
+    """
+    start_ns = time.perf_counter_ns()
+    try:
+        df = requirement_bot(file_path, cm_file, keywords, folder_output, confidence_threshold)
+    except Exception as e:
+        worker_logger.exception(f"Error processing file {file_path}: {e}")
+        return None, _elapsed_seconds(start_ns), str(e)
+    return df, _elapsed_seconds(start_ns), None
+
+
+def _elapsed_seconds(start_ns):
+    """Seconds since a time.perf_counter_ns() reading, at microsecond resolution."""
+    return round((time.perf_counter_ns() - start_ns) / 1e9, 6)
+
 
 class ProcessingWorker(QObject):
     # Signals to communicate with the GUI thread
@@ -83,16 +135,17 @@ class ProcessingWorker(QObject):
             # v2.2: Use provided keywords if available, otherwise load from config
             if self._keywords:
                 parole_chiave = self._keywords
-                self.log_message.emit(f"Using selected keyword profile: {', '.join(parole_chiave)}", "info")
+                keyword_header = ', '.join(parole_chiave)
+                self.log_message.emit(f"Using selected keyword profile: {keyword_header}", "info")
             else:
                 parole_chiave = load_keyword_config()
-                self.log_message.emit(f"Keywords loaded from config: {', '.join(parole_chiave)}", "info")
+                keyword_header = ', '.join(parole_chiave)
+                self.log_message.emit(f"Keywords loaded from config: {keyword_header}", "info")
 
             # Set report metadata
             report.set_metadata(list(parole_chiave), self._confidence_threshold)
 
-            lista_file = get_all(self._folder_input, 'pdf')
-            filtered_files = [file for file in lista_file if "Tagged" not in file]
+            filtered_files = [file for file in get_all(self._folder_input, 'pdf') if "Tagged" not in file]
             total_files = len(filtered_files)
 
             if total_files == 0:
@@ -111,7 +164,7 @@ class ProcessingWorker(QObject):
                 try:
                     processing_session = ProcessingSessionService.create_session(
                         project_id=project.id,
-                        keywords_used=', '.join(parole_chiave),
+                        keywords_used=keyword_header,
                         confidence_threshold=self._confidence_threshold
                     )
                     if processing_session:
@@ -120,115 +173,88 @@ class ProcessingWorker(QObject):
                     worker_logger.error(f"Failed to create processing session: {str(e)}")
                     self.log_message.emit("Warning: Could not create processing session", "warning")
 
+            # v3.0: Look up or register all documents of the batch at once
+            documents = {}
+            if DATABASE_AVAILABLE and project:
+                documents = sync_documents(project, filtered_files)
+
             total_requirements = 0
             total_working_time = 0
 
             # Ensure the output directory exists
-            os.makedirs(self._folder_output, exist_ok=True)
-            log_file_path = os.path.join(self._folder_output, "LOG.txt")
+            out_dir = Path(self._folder_output)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            log_file_path = out_dir / "LOG.txt"
 
-            with open(log_file_path, "w") as f:
-                f.write("Keyword: " + ', '.join(parole_chiave) + "\n\n")
+            # One write per file into a large buffer instead of a write() per line
+            with open(log_file_path, "w", buffering=1 << 20, encoding="utf-8") as f:
+                f.write("Keyword: " + keyword_header + "\n\n")
                 self.log_message.emit(f"Log file created at: {log_file_path}", "info")
 
-                for i, file_path in enumerate(filtered_files):
-                    if not self._is_running:  # Allow stopping the process
-                        cancel_msg = "Processing cancelled."
-                        self.log_message.emit(cancel_msg, "warning")
-                        report.add_warning(cancel_msg)
-                        break
-
-                    # Calculate base progress for this file (0-90% range, leaving 10% for report)
-                    file_base_progress = int((i / total_files) * 90)
-                    file_progress_range = int((1 / total_files) * 90)
-
-                    # Update progress: Starting file
-                    self.progress_updated.emit(file_base_progress)
-
-                    start_time = datetime.now()
-                    file_warnings = []
-                    try:
-                        # Step 1: Processing PDF (25% of file progress)
-                        filename = os.path.basename(file_path)
-                        self.log_message.emit(f"[{i+1}/{total_files}] Analyzing PDF: {filename}", "info")
-                        self.progress_detail_updated.emit(f"File {i+1}/{total_files}: Analyzing {filename}...")  # v2.3
-                        self.progress_updated.emit(file_base_progress + int(file_progress_range * 0.25))
-
-                        # Step 2: Extracting requirements (main processing in requirement_bot)
-                        # This includes PDF analysis, Excel writing, BASIL export, and highlighting
-                        # v3.0: Pass project to requirement_bot for database persistence
-                        # v2.3: Detailed progress update
-                        extract_msg = f"File {i+1}/{total_files}: Extracting requirements from {filename}..."
-                        self.progress_detail_updated.emit(extract_msg)
-                        df = requirement_bot(
-                            file_path,
-                            self._CM_file,
-                            parole_chiave,
-                            self._folder_output,
-                            self._confidence_threshold,
-                            project=project  # v3.0: Pass project for database persistence
-                        )
-
-                        # Step 3: File completed (100% of file progress)
-                        self.progress_updated.emit(file_base_progress + file_progress_range)
-                        # v2.3: Progress update
-                        progress_msg = f"File {i+1}/{total_files}: Completed {filename} ({len(df)} requirements)"
-                        self.progress_detail_updated.emit(progress_msg)
-                        log_msg = (
-                            f"[{i+1}/{total_files}] Completed {os.path.basename(file_path)}. "
-                            f"Found {len(df)} requirements."
-                        )
-                        self.log_message.emit(log_msg, "info")
-
-                        # Calculate average confidence for this file
-                        if 'Confidence' in df.columns and len(df) > 0:
-                            avg_confidence = df['Confidence'].mean()
-                        else:
-                            avg_confidence = 0.0
-
-                        # Check for low confidence warnings
-                        if avg_confidence < 0.6 and len(df) > 0:
-                            low_conf_msg = (
-                                f"Low average confidence ({avg_confidence:.2f}) "
-                                f"in {os.path.basename(file_path)}"
-                            )
-                            file_warnings.append(low_conf_msg)
-                            report.add_warning(low_conf_msg)
-
-                    except Exception as e:
-                        worker_logger.exception(f"Error processing file {file_path}: {e}")
-                        error_msg = f"Error processing {os.path.basename(file_path)}: {str(e)}"
-                        self.log_message.emit(error_msg, "error")
-                        report.add_error(error_msg)
-
-                        # Still update progress even on error
-                        self.progress_updated.emit(file_base_progress + file_progress_range)
-                        continue  # Skip this file and continue with the next
-
-                    end_time = datetime.now()
-                    execution_time = end_time - start_time
-                    total_requirements += len(df)
-                    total_working_time += round(len(df) * (5 / 60), 2)
-
-                    # Add file result to report
-                    report.add_file_result(
-                        filename=os.path.basename(file_path),
-                        req_count=len(df),
-                        avg_confidence=avg_confidence,
-                        execution_time_seconds=execution_time.total_seconds(),
-                        file_warnings=file_warnings
-                    )
-
-                    f.write("PDF Name: " + os.path.basename(file_path) + "\n")
-                    f.write("Number of Requirements: " + str(len(df)) + "\n")
-                    f.write("Average Confidence: " + str(round(avg_confidence, 3)) + "\n")
-                    f.write("Estimated time for manual analysis: " + str(round(len(df) * (5 / 60), 2)) + " hrs" + "\n")
-                    f.write("Execution Time: " + str(execution_time.total_seconds()) + " seconds\n\n")
+                # Each PDF is independent, so the batch is fanned out to one process per core.
+                # PyMuPDF is not thread-safe, hence processes rather than threads.
+                self.progress_detail_updated.emit(f"Analyzing {total_files} PDF file(s) and extracting requirements...")
+
+                # Spawned rather than forked: this thread's process also runs Qt and thread pools,
+                # whose locks a forked child could inherit in a held state.
+                with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, total_files),
+                                         mp_context=multiprocessing.get_context("spawn")) as executor:
+                    futures = {
+                        executor.submit(_run_one, file_path, self._CM_file, parole_chiave,
+                                        self._folder_output, self._confidence_threshold): index
+                        for index, file_path in enumerate(filtered_files)
+                    }
+                    # Results arrive in completion order but are recorded in input order,
+                    # so LOG.txt and the report list the files deterministically
+                    completed = {}
+                    next_index = 0
+                    last_progress_emit = 0.0
+                    for done, future in enumerate(as_completed(futures), 1):
+                        if not self._is_running:  # Allow stopping the process
+                            # Files not started yet are dropped; running ones finish their current PDF
+                            for pending in futures:
+                                pending.cancel()
+                            cancel_msg = "Processing cancelled."
+                            self.log_message.emit(cancel_msg, "warning")
+                            report.add_warning(cancel_msg)
+                            break
+
+                        index = futures[future]
+                        try:
+                            completed[index] = future.result()
+                        except Exception as e:  # e.g. BrokenProcessPool if a worker process died
+                            worker_logger.exception(f"Error processing file {filtered_files[index]}: {e}")
+                            completed[index] = (None, 0.0, str(e))
+
+                        # Progress covers 0-90%, leaving 10% for the report. Signals are rate-limited
+                        # so large batches don't flood the GUI thread; the last file always reports.
+                        now = time.monotonic()
+                        if done == total_files or now - last_progress_emit >= PROGRESS_EMIT_INTERVAL:
+                            last_progress_emit = now
+                            self.progress_updated.emit(int((done / total_files) * 90))
+                            self.progress_detail_updated.emit(
+                                f"File {done}/{total_files}: Completed {os.path.basename(filtered_files[index])}")
+
+                        while next_index in completed:
+                            n_requirements, hours = self._record_result(
+                                next_index, filtered_files, completed.pop(next_index), project, documents, report, f)
+                            total_requirements += n_requirements
+                            total_working_time += hours
+                            next_index += 1
+
+                    # After a cancellation, files that finished behind an unfinished one are still recorded
+                    for index in sorted(completed):
+                        n_requirements, hours = self._record_result(
+                            index, filtered_files, completed[index], project, documents, report, f)
+                        total_requirements += n_requirements
+                        total_working_time += hours
 
                 # Write final summary to the log file
-                f.write("--- Summary ---\n")
-                f.write("Total Requirements: " + str(total_requirements) + "\n")
-                f.write("Total Estimated time for manual analysis: " + str(total_working_time) + " hrs\n")
+                f.write(
+                    f"--- Summary ---\n"
+                    f"Total Requirements: {total_requirements}\n"
+                    f"Total Estimated time for manual analysis: {total_working_time} hrs\n"
+                )
                 self.log_message.emit(f"Processing loop finished. Total requirements found: {total_requirements}", "info")
 
             # Mark end of processing
@@ -253,7 +279,7 @@ class ProcessingWorker(QObject):
             self.progress_detail_updated.emit("Generating processing report...")  # v2.3
             self.log_message.emit("Generating processing report...", "info")
             report_date = datetime.now().strftime("%Y.%m.%d_%H%M%S")
-            report_path = os.path.join(self._folder_output, f"{report_date}_Processing_Report.html")
+            report_path = str(out_dir / f"{report_date}_Processing_Report.html")
 
             if report.generate_html_report(report_path):
                 self.log_message.emit(f"HTML report generated: {report_path}", "info")
@@ -284,6 +310,75 @@ class ProcessingWorker(QObject):
             self.progress_updated.emit(0)  # Reset progress bar
             self._is_running = False  # Ensure worker state is reset
 
+    def _record_result(self, index, filtered_files, result, project, documents, report, log_file):
+        """
+        Persist, log and report the result of one PDF.
+
+        Args:
+            index: Position of the PDF in filtered_files
+            filtered_files: All PDFs of the batch, in input order
+            result: (DataFrame or None, execution time in seconds, error message or None) from _run_one
+            project: Project object for database persistence, or None
+            documents: Input path -> Document resolved by sync_documents
+            report: Processing report being built
+            log_file: Open LOG.txt file
+
+        Returns:
+            tuple: (number of requirements, estimated manual analysis hours)
+        """
+        df, execution_seconds, error = result
+        file_path = filtered_files[index]
+        total_files = len(filtered_files)
+        filename = os.path.basename(file_path)
+
+        if error is not None:
+            error_msg = f"Error processing {filename}: {error}"
+            self.log_message.emit(error_msg, "error")
+            report.add_error(error_msg)
+            return 0, 0  # Skip this file and continue with the next
+
+        # v3.0: Database persistence happens here, sessions stay in this process
+        if project is not None:
+            persist_requirements(df, project, file_path, document=documents.get(file_path))
+
+        n_requirements = len(df)
+        self.log_message.emit(
+            f"[{index+1}/{total_files}] Completed {filename}. Found {n_requirements} requirements.", "info"
+        )
+
+        # Calculate average confidence for this file
+        if 'Confidence' in df.columns and n_requirements > 0:
+            avg_confidence = df['Confidence'].mean()
+        else:
+            avg_confidence = 0.0
+
+        # Check for low confidence warnings
+        file_warnings = []
+        if avg_confidence < 0.6 and n_requirements > 0:
+            low_conf_msg = f"Low average confidence ({avg_confidence:.2f}) in {filename}"
+            file_warnings.append(low_conf_msg)
+            report.add_warning(low_conf_msg)
+
+        hours = round(n_requirements * HOURS_PER_REQUIREMENT, 2)
+
+        # Add file result to report
+        report.add_file_result(
+            filename=filename,
+            req_count=n_requirements,
+            avg_confidence=avg_confidence,
+            execution_time_seconds=execution_seconds,
+            file_warnings=file_warnings
+        )
+
+        log_file.write(LOG_ENTRY.format(
+            name=filename,
+            n=n_requirements,
+            confidence=round(avg_confidence, 3),
+            hours=hours,
+            seconds=execution_seconds
+        ))
+        return n_requirements, hours
+
     def stop(self):
         """Allows gracefully stopping the worker thread."""
         self._is_running = False
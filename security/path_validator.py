@@ -6,6 +6,7 @@ Prevents path traversal attacks and validates file system operations.
 """
 
 import os
+import stat
 import logging
 from pathlib import Path
 from typing import Optional, List
@@ -26,6 +27,14 @@ SUSPICIOUS_PATH_PATTERNS = [
 ]
 
 
+def _stat_or_none(path_obj: Path) -> Optional[os.stat_result]:
+    """Return os.stat() for a path, or None if it does not exist or cannot be accessed."""
+    try:
+        return path_obj.stat()
+    except (OSError, ValueError):
+        return None
+
+
 def validate_safe_path(
     path: str,
     base_dir: Optional[str] = None,
@@ -68,15 +77,20 @@ def validate_safe_path(
     except (ValueError, OSError, RuntimeError) as e:
         raise PathValidationError(f"Invalid path format: {str(e)}")
 
+    # Stat the path once; the existence, type and extension checks below reuse the result
+    path_stat = _stat_or_none(path_obj)
+    is_file = path_stat is not None and stat.S_ISREG(path_stat.st_mode)
+    is_dir = path_stat is not None and stat.S_ISDIR(path_stat.st_mode)
+
     # Check if path exists
-    if must_exist and not path_obj.exists():
+    if must_exist and path_stat is None:
         raise PathValidationError(f"Path does not exist: {path}")
 
     # Check path type if it exists
-    if path_obj.exists():
-        if path_type == 'file' and not path_obj.is_file():
+    if path_stat is not None:
+        if path_type == 'file' and not is_file:
             raise PathValidationError(f"Expected a file, but got a directory: {path}")
-        elif path_type == 'directory' and not path_obj.is_dir():
+        elif path_type == 'directory' and not is_dir:
             raise PathValidationError(f"Expected a directory, but got a file: {path}")
 
     # Check if path is within base directory (prevents path traversal)
@@ -95,7 +109,7 @@ def validate_safe_path(
             raise PathValidationError(f"Invalid base directory: {str(e)}")
 
     # Check file extension for files
-    if allowed_extensions and (path_obj.is_file() or path_type == 'file'):
+    if allowed_extensions and (is_file or path_type == 'file'):
         if path_obj.suffix.lower() not in [ext.lower() for ext in allowed_extensions]:
             raise PathValidationError(
                 f"Invalid file extension: {path_obj.suffix}. "
@@ -310,11 +324,48 @@ def validate_pdf_input(path: str, base_dir: Optional[str] = None) -> Path:
     )
 
 
+# Successful template/directory validations, keyed by the call arguments plus the
+# path's stat identity. Batch runs validate the same template and output folder for
+# every PDF; replacing, modifying or chmod-ing the path changes the key.
+_VALIDATION_CACHE = {}
+_VALIDATION_CACHE_MAX_SIZE = 256
+
+
+def _validation_cache_key(*args) -> Optional[tuple]:
+    """Build a cache key from (kind, path, *options), or None if the path cannot be stat'ed."""
+    path = args[1]
+    if not path or not isinstance(path, str):
+        return None
+    try:
+        path_stat = os.stat(path)
+        abs_path = os.path.abspath(path)
+    except (OSError, ValueError):
+        return None
+    return (abs_path,) + args + (path_stat.st_dev, path_stat.st_ino,
+                                 path_stat.st_mtime_ns, path_stat.st_ctime_ns)
+
+
+def _remember_validation(key: Optional[tuple], path_obj: Path) -> Path:
+    """Store a successful validation result in the cache and return it."""
+    if key is not None:
+        if len(_VALIDATION_CACHE) >= _VALIDATION_CACHE_MAX_SIZE:
+            _VALIDATION_CACHE.clear()
+        _VALIDATION_CACHE[key] = path_obj
+    return path_obj
+
+
+def clear_validation_cache() -> None:
+    """Forget all cached validate_excel_template/validate_directory results."""
+    _VALIDATION_CACHE.clear()
+
+
 # Convenience function for common Excel validation
 def validate_excel_template(path: str) -> Path:
     """
     Validate an Excel template file path.
 
+    Successful results are cached until the file changes on disk.
+
     Args:
         path: Path to Excel template file
 
@@ -324,12 +375,16 @@ def validate_excel_template(path: str) -> Path:
     Raises:
         PathValidationError: If path is invalid
     """
-    return validate_safe_path(
+    key = _validation_cache_key('excel_template', path)
+    if key is not None and key in _VALIDATION_CACHE:
+        return _VALIDATION_CACHE[key]
+
+    return _remember_validation(key, validate_safe_path(
         path,
         must_exist=True,
         allowed_extensions=['.xlsx', '.XLSX'],
         path_type='file'
-    )
+    ))
 
 
 # Convenience function for directory validation
@@ -337,6 +392,9 @@ def validate_directory(path: str, must_exist: bool = True, check_writable: bool
     """
     Validate a directory path.
 
+    Successful results for existing directories are cached until the directory
+    changes on disk (including permission changes).
+
     Args:
         path: Directory path
         must_exist: Whether directory must exist
@@ -348,6 +406,10 @@ def validate_directory(path: str, must_exist: bool = True, check_writable: bool
     Raises:
         PathValidationError: If path is invalid
     """
+    key = _validation_cache_key('directory', path, must_exist, check_writable)
+    if key is not None and key in _VALIDATION_CACHE:
+        return _VALIDATION_CACHE[key]
+
     path_obj = validate_safe_path(
         path,
         must_exist=must_exist,
@@ -358,4 +420,4 @@ def validate_directory(path: str, must_exist: bool = True, check_writable: bool
         if not os.access(path_obj, os.W_OK):
             raise PathValidationError(f"Directory is not writable: {path}")
 
-    return path_obj
+    return _remember_validation(key, path_obj)
@@ -45,9 +45,15 @@ def qt_cleanup(request, qapp_session):
     """
     Auto-use fixture that ensures Qt cleanup after each test.
     Helps prevent Windows fatal exception on test cleanup.
+
+    Only tests that use Qt (marked qt_heavy or using qtbot) are cleaned up
+    here; other tests rely on the once-per-module cleanup in qt_module_cleanup.
     """
     yield
 
+    if not (request.node.get_closest_marker("qt_heavy") or "qtbot" in request.fixturenames):
+        return
+
     # Post-test cleanup
     app = qapp_session
 
@@ -62,6 +68,19 @@ def qt_cleanup(request, qapp_session):
     app.processEvents()
 
 
+@pytest.fixture(scope="module", autouse=True)
+def qt_module_cleanup(qapp_session):
+    """
+    Module-scoped cleanup: flush posted events and collect garbage once after each test module.
+    """
+    yield
+
+    qapp_session.sendPostedEvents(None, 0)
+    qapp_session.processEvents()
+    gc.collect()
+    qapp_session.processEvents()
+
+
 def pytest_configure(config):
     """
     Pytest configuration hook.
@@ -73,6 +92,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: mark test as slow running"
     )
+    config.addinivalue_line(
+        "markers", "qt_heavy: mark test as creating Qt widgets (forces gc.collect() after the test)"
+    )
 
 
 def pytest_exception_interact(node, call, report):
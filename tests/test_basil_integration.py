@@ -11,6 +11,7 @@ import pandas as pd
 from basil_integration import (
     calculate_md5_hash,
     extract_requirement_id,
+    extract_requirement_ids,
     create_basil_requirement,
     export_to_basil,
     import_from_basil,
@@ -133,6 +134,16 @@ class TestUtilityFunctions:
         assert extract_requirement_id("Req#abc") == 0
         assert extract_requirement_id("") == 0
 
+    def test_extract_requirement_ids_matches_scalar(self):
+        """Test that the vectorized extraction agrees with extract_requirement_id."""
+        labels = ["spec-Req#42-1", "document-Req#1-1", "test-Req#999-5", "invalid-label",
+                  "Req#abc", "", "x-Req#12a-1", "x-Req#7"]
+
+        ids = extract_requirement_ids(pd.Series(labels))
+
+        assert ids.tolist() == [extract_requirement_id(label) for label in labels]
+        assert extract_requirement_ids(pd.Series([None, "a-Req#3-1"])).tolist() == [0, 3]
+
     def test_create_basil_requirement(self):
         """Test creation of BASIL requirement elements."""
         file_elem, annotation_elem = create_basil_requirement(
@@ -167,6 +178,32 @@ class TestUtilityFunctions:
         assert statement["reqbot_metadata"]["confidence"] == 0.85
         assert statement["reqbot_metadata"]["priority"] == "high"
 
+    def test_statement_json_same_without_orjson(self, monkeypatch):
+        """Test that the stdlib fallback serializes statements exactly like orjson."""
+        import basil_integration
+
+        data = {"id": 7, "title": "Tïtle", "status": "CRITICAL",
+                "reqbot_metadata": {"page": 3, "confidence": 0.5, "priority": "security"}}
+        expected = basil_integration._dumps(data)
+        monkeypatch.setattr(basil_integration, "ORJSON_AVAILABLE", False)
+
+        assert basil_integration._dumps(data) == expected
+        assert json.loads(expected) == data
+
+    def test_statement_json_nan_written_as_null(self, monkeypatch):
+        """Test that NaN and Infinity are written as null with and without orjson."""
+        import numpy as np
+        import basil_integration
+
+        data = {"id": 1, "reqbot_metadata": {"page": 2, "confidence": float("nan"),
+                                             "scores": [np.float64("inf"), 0.5]}}
+        expected = '{"id":1,"reqbot_metadata":{"page":2,"confidence":null,"scores":[null,0.5]}}'
+
+        if basil_integration.ORJSON_AVAILABLE:
+            assert basil_integration._dumps(data) == expected
+        monkeypatch.setattr(basil_integration, "ORJSON_AVAILABLE", False)
+        assert basil_integration._dumps(data) == expected
+
 
 class TestExportFunctionality:
     """Test BASIL export functionality."""
@@ -291,6 +328,21 @@ class TestImportFunctionality:
         assert df.iloc[0]['Page'] == 1
         assert df.iloc[0]['Keyword'] == "shall"
 
+    def test_import_same_without_ijson(self, sample_basil_json, tmp_path, monkeypatch):
+        """Test that the json.load fallback imports the same data as streaming."""
+        import basil_integration
+
+        input_file = tmp_path / "test_import.jsonld"
+        with open(input_file, 'w') as f:
+            json.dump(sample_basil_json, f)
+
+        streamed = import_from_basil(str(input_file))
+        monkeypatch.setattr(basil_integration, "IJSON_AVAILABLE", False)
+        loaded = import_from_basil(str(input_file))
+
+        assert len(loaded) == 1
+        pd.testing.assert_frame_equal(streamed, loaded)
+
     def test_import_missing_file(self):
         """Test import with non-existent file."""
         df = import_from_basil("nonexistent_file.jsonld")
@@ -508,6 +560,26 @@ class TestMergeStrategies:
         req3 = merged[merged['Label Number'] == 'test-Req#3-1'].iloc[0]
         assert req3['Description'] == 'New requirement 3'
 
+    def test_merge_update_duplicate_imported_labels(self):
+        """Test that the last imported row wins and new labels are added once."""
+        existing_df = pd.DataFrame({
+            'Label Number': ['test-Req#1-1'],
+            'Description': ['Old description 1'],
+            'Priority': ['low']
+        })
+
+        imported_df = pd.DataFrame({
+            'Label Number': ['test-Req#1-1', 'test-Req#2-1', 'test-Req#1-1', 'test-Req#2-1'],
+            'Description': ['First update', 'First new', 'Second update', 'Second new'],
+            'Priority': ['medium', 'low', 'high', 'high']
+        })
+
+        merged = merge_basil_requirements(existing_df, imported_df, merge_strategy="update")
+
+        assert merged['Label Number'].tolist() == ['test-Req#1-1', 'test-Req#2-1']
+        assert merged['Description'].tolist() == ['Second update', 'Second new']
+        assert merged['Priority'].tolist() == ['high', 'high']
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
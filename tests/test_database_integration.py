@@ -87,6 +87,24 @@ def test_database_initialization(test_db):
         print(f"[OK] Database initialized (type: {info['type']})")
 
 
+def test_readonly_engine(test_db):
+    """Test that the read-only engine can query but not write."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from database.database import get_engine, get_readonly_engine
+
+    engine = get_readonly_engine()
+    assert engine is not get_engine()
+    assert get_readonly_engine() is engine
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM projects")).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("CREATE TABLE readonly_probe (id INTEGER)"))
+
+    print("[OK] Read-only engine rejects writes")
+
+
 @pytest.fixture
 def project(test_db):
     """Fixture to create a test project."""
@@ -292,6 +292,46 @@ class TestRequirementModel:
         assert req.priority == Priority.SECURITY
         assert isinstance(req.priority, Priority)
 
+    def test_requirement_priority_stored_by_name(self, test_session):
+        """Test priority is stored by enum name and loads back as the enum."""
+        from sqlalchemy import text
+
+        project = Project(
+            name="Test Project",
+            input_folder_path="/input",
+            output_folder_path="/output"
+        )
+        test_session.add(project)
+        test_session.flush()
+
+        doc = Document(
+            project_id=project.id,
+            filename="test.pdf",
+            file_path="/path/test.pdf",
+            file_hash="abc123"
+        )
+        test_session.add(doc)
+        test_session.flush()
+
+        req = Requirement(
+            document_id=doc.id,
+            project_id=project.id,
+            label_number="test-Req#1-1",
+            description="High priority requirement",
+            page_number=1,
+            priority="high"
+        )
+        test_session.add(req)
+        test_session.flush()
+
+        stored = test_session.execute(
+            text("SELECT priority FROM requirements WHERE id = :id"), {"id": req.id}
+        ).scalar()
+        assert stored == "HIGH"
+
+        test_session.expire(req)
+        assert req.priority is Priority.HIGH
+
 
 class TestRequirementHistoryModel:
     """Test RequirementHistory model."""
@@ -394,6 +434,68 @@ class TestRequirementHistoryModel:
         assert history.snapshot_data["old_description"] == "Original"
         assert isinstance(history.snapshot_data, dict)
 
+    def test_history_snapshot_data_compressed(self, test_session):
+        """Test snapshot_data is stored compressed and legacy JSON text still loads."""
+        from sqlalchemy import text
+
+        project = Project(
+            name="Test Project",
+            input_folder_path="/input",
+            output_folder_path="/output"
+        )
+        test_session.add(project)
+        test_session.flush()
+
+        doc = Document(
+            project_id=project.id,
+            filename="test.pdf",
+            file_path="/path/test.pdf",
+            file_hash="abc123"
+        )
+        test_session.add(doc)
+        test_session.flush()
+
+        req = Requirement(
+            document_id=doc.id,
+            project_id=project.id,
+            label_number="test-Req#1-1",
+            description="Test",
+            page_number=1
+        )
+        test_session.add(req)
+        test_session.flush()
+
+        snapshot = {"description": "The system shall log every access. " * 20, "priority": "high"}
+        history = RequirementHistory(
+            requirement_id=req.id,
+            version=1,
+            description="Test",
+            change_type=ChangeType.CREATED,
+            snapshot_data=snapshot
+        )
+        test_session.add(history)
+        test_session.flush()
+
+        stored = test_session.execute(
+            text("SELECT snapshot_data FROM requirement_history WHERE id = :id"), {"id": history.id}
+        ).scalar()
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(snapshot["description"])
+        # Always zlib, readable whether or not optional compressors are installed
+        import zlib
+        assert zlib.decompress(stored).startswith(b'{"description"')
+
+        test_session.expire(history)
+        assert history.snapshot_data == snapshot
+
+        # Rows written as JSON text by older versions
+        test_session.execute(
+            text("UPDATE requirement_history SET snapshot_data = :data WHERE id = :id"),
+            {"data": '{"priority": "low"}', "id": history.id}
+        )
+        test_session.expire(history)
+        assert history.snapshot_data == {"priority": "low"}
+
 
 class TestProcessingSessionModel:
     """Test ProcessingSession model."""
@@ -168,6 +168,29 @@ class TestProjectService:
         )
         assert updated.is_active is False
 
+    def test_get_all_projects_active_only(self, test_session):
+        """Test listing projects skips deactivated ones."""
+        active = ProjectService.create_project(
+            name="Active Project",
+            input_folder_path="/input",
+            output_folder_path="/output",
+            session=test_session
+        )
+        inactive = ProjectService.create_project(
+            name="Inactive Project",
+            input_folder_path="/input",
+            output_folder_path="/output",
+            session=test_session
+        )
+        ProjectService.deactivate_project(inactive.id, session=test_session)
+
+        active_ids = {p.id for p in ProjectService.get_all_projects(session=test_session)}
+        all_ids = {p.id for p in ProjectService.get_all_projects(active_only=False, session=test_session)}
+
+        assert active.id in active_ids
+        assert inactive.id not in active_ids
+        assert {active.id, inactive.id} <= all_ids
+
 
 class TestDocumentService:
     """Test DocumentService methods."""
@@ -217,6 +240,202 @@ class TestDocumentService:
         assert updated.processing_status == ProcessingStatus.COMPLETED
         assert updated.processed_at is not None
 
+    def test_calculate_file_hash(self, tmp_path):
+        """Test file hashes are 256-bit hex digests that track content."""
+        pdf = tmp_path / "spec.pdf"
+        pdf.write_bytes(b"%PDF-1.4 original")
+        first = DocumentService.calculate_file_hash(str(pdf))
+
+        # BLAKE2b-256, independent of optional packages
+        assert first == "52cd879de27b958d3b84775b6a5ca2e817be4efaa8646dd9f9a926061460ed08"
+        assert DocumentService.calculate_file_hash(str(pdf)) == first
+
+        pdf.write_bytes(b"%PDF-1.4 changed")
+        assert DocumentService.calculate_file_hash(str(pdf)) != first
+        assert DocumentService.calculate_file_hash(str(tmp_path / "missing.pdf")) == ""
+
+    def test_calculate_file_hash_small_and_large_files(self, tmp_path):
+        """Test memory-mapped and streamed hashing agree on file contents."""
+        import hashlib
+        from database.services import document_service
+
+        for size in (0, 1024, document_service._HASH_MMAP_MAX_SIZE + 1):
+            content = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+            pdf = tmp_path / f"{size}.pdf"
+            pdf.write_bytes(content)
+            expected = hashlib.blake2b(content, digest_size=32).hexdigest()
+            assert DocumentService.calculate_file_hash(str(pdf)) == expected
+
+    def test_calculate_file_hash_memoized(self, tmp_path):
+        """Test file hashes are memoized until the file's mtime or size changes."""
+        import os
+        from database.services.document_service import _hash_file
+
+        pdf = tmp_path / "cached.pdf"
+        pdf.write_bytes(b"%PDF-1.4 one")
+        DocumentService.clear_hash_cache()
+        first = DocumentService.calculate_file_hash(str(pdf))
+        assert DocumentService.calculate_file_hash(str(pdf)) == first
+        assert _hash_file.cache_info().hits == 1
+
+        # Same size, new content and mtime
+        pdf.write_bytes(b"%PDF-1.4 two")
+        stat = pdf.stat()
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert DocumentService.calculate_file_hash(str(pdf)) != first
+        DocumentService.clear_hash_cache()
+        assert _hash_file.cache_info().currsize == 0
+
+    def test_check_then_create_reads_file_once(self, test_session, test_project, tmp_path):
+        """Test should_process_document followed by get_or_create_document reuses the file's hash."""
+        from database.services.document_service import _hash_file, _sample_file
+
+        pdf = tmp_path / "once.pdf"
+        pdf.write_bytes(b"%PDF-1.4 once")
+        DocumentService.clear_hash_cache()
+        DocumentService.create_document(
+            project_id=test_project.id,
+            filename="once.pdf",
+            file_path=str(pdf),
+            file_hash="00" * 32,
+            session=test_session
+        )
+        pdf.write_bytes(b"%PDF-1.4 twice")
+
+        assert DocumentService.should_process_document(
+            test_project.id, "once.pdf", str(pdf), session=test_session)
+        doc, is_new = DocumentService.get_or_create_document(
+            project_id=test_project.id,
+            filename="once.pdf",
+            file_path=str(pdf),
+            session=test_session
+        )
+
+        assert not is_new and doc.processing_status == ProcessingStatus.PENDING
+        assert _hash_file.cache_info().misses == 1
+        # One sample for the first version of the file, one for the edited one
+        assert _sample_file.cache_info().misses == 2
+
+    def test_legacy_md5_hash_upgraded(self, test_session, test_project, tmp_path):
+        """Test documents stored with an MD5 hash are not reprocessed."""
+        import hashlib
+
+        pdf = tmp_path / "legacy.pdf"
+        pdf.write_bytes(b"%PDF-1.4 legacy")
+        legacy = DocumentService.create_document(
+            project_id=test_project.id,
+            filename="legacy.pdf",
+            file_path=str(pdf),
+            file_hash=hashlib.md5(pdf.read_bytes()).hexdigest(),
+            session=test_session
+        )
+        # Older versions recorded no fingerprint
+        legacy.additional_data = None
+
+        doc, is_new = DocumentService.get_or_create_document(
+            project_id=test_project.id,
+            filename="legacy.pdf",
+            file_path=str(pdf),
+            session=test_session
+        )
+
+        assert not is_new
+        assert doc.processing_status == ProcessingStatus.PENDING
+        assert doc.file_hash == DocumentService.calculate_file_hash(str(pdf))
+
+    def test_unchanged_document_skips_full_hash(self, test_session, test_project, tmp_path, monkeypatch):
+        """Test the size + sampled fingerprint check avoids rehashing unchanged files."""
+        import os
+
+        pdf = tmp_path / "large.pdf"
+        pdf.write_bytes(b"a" * (512 * 1024))
+        doc, is_new = DocumentService.get_or_create_document(
+            project_id=test_project.id,
+            filename="large.pdf",
+            file_path=str(pdf),
+            session=test_session
+        )
+        assert is_new
+        assert doc.file_size_bytes == 512 * 1024
+        DocumentService.update_processing_status(doc.id, ProcessingStatus.COMPLETED, session=test_session)
+
+        calls = []
+        original_hash = DocumentService.calculate_file_hash
+        monkeypatch.setattr(DocumentService, "calculate_file_hash",
+                            staticmethod(lambda path: calls.append(path) or original_hash(path)))
+
+        assert not DocumentService.should_process_document(
+            test_project.id, "large.pdf", str(pdf), session=test_session)
+        same_doc, is_new = DocumentService.get_or_create_document(
+            project_id=test_project.id,
+            filename="large.pdf",
+            file_path=str(pdf),
+            session=test_session
+        )
+        assert same_doc.id == doc.id and not is_new
+        assert calls == []
+
+        # Same size, edited outside the sampled windows: caught by the full hash
+        with open(pdf, "r+b") as f:
+            f.seek(100 * 1024)
+            f.write(b"b")
+        stat = pdf.stat()
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert DocumentService.should_process_document(
+            test_project.id, "large.pdf", str(pdf), session=test_session)
+        assert calls == [str(pdf)]
+
+    def test_sync_folder(self, test_session, test_project, tmp_path):
+        """Test bulk get-or-create of a folder's documents."""
+        for name, content in (("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF b"), ("copy.pdf", b"%PDF a")):
+            (tmp_path / name).write_bytes(content)
+        files = [(name, str(tmp_path / name)) for name in ("a.pdf", "b.pdf")]
+
+        first = DocumentService.sync_folder(test_project.id, files, session=test_session)
+        assert [is_new for _, is_new in first.values()] == [True, True]
+        assert first["a.pdf"][0].id is not None
+
+        (tmp_path / "b.pdf").write_bytes(b"%PDF b, edited")
+        DocumentService.update_processing_status(first["b.pdf"][0].id, ProcessingStatus.COMPLETED,
+                                                 session=test_session)
+        second = DocumentService.sync_folder(
+            test_project.id, files + [("copy.pdf", str(tmp_path / "copy.pdf"))], session=test_session)
+
+        assert second["a.pdf"] == (first["a.pdf"][0], False)
+        changed, is_new = second["b.pdf"]
+        assert not is_new and changed.processing_status == ProcessingStatus.PENDING
+        assert changed.file_size_bytes == len(b"%PDF b, edited")
+        # Same content as a.pdf: rejected by uix_project_file_hash
+        assert second["copy.pdf"] == (None, False)
+
+    def test_sync_folder_detects_legacy_duplicates(self, test_session, test_project, tmp_path):
+        """Test duplicates of documents stored with an MD5 hash, as bytes or as hex text, are skipped."""
+        import hashlib
+        from sqlalchemy import text
+
+        for name in ("old_bytes.pdf", "old_text.pdf", "copy_bytes.pdf", "copy_text.pdf"):
+            (tmp_path / name).write_bytes(b"%PDF " + name.split("_")[1].encode())
+        DocumentService.create_document(
+            project_id=test_project.id,
+            filename="old_bytes.pdf",
+            file_path=str(tmp_path / "old_bytes.pdf"),
+            file_hash=hashlib.md5(b"%PDF bytes.pdf").hexdigest(),
+            session=test_session
+        )
+        # Versions before HexDigest stored the hex text itself
+        test_session.execute(text(
+            "INSERT INTO documents (project_id, filename, file_path, file_hash, processing_status) "
+            "VALUES (:project_id, 'old_text.pdf', :path, :file_hash, 'COMPLETED')"
+        ), {'project_id': test_project.id, 'path': str(tmp_path / "old_text.pdf"),
+            'file_hash': hashlib.md5(b"%PDF text.pdf").hexdigest()})
+
+        synced = DocumentService.sync_folder(test_project.id, [
+            (name, str(tmp_path / name)) for name in ("copy_bytes.pdf", "copy_text.pdf")
+        ], session=test_session)
+
+        assert synced == {"copy_bytes.pdf": (None, False), "copy_text.pdf": (None, False)}
+
 
 class TestRequirementService:
     """Test RequirementService methods."""
@@ -322,6 +541,248 @@ class TestRequirementService:
         assert len(high_reqs) == 1
         assert high_reqs[0].priority == Priority.HIGH
 
+    def test_bulk_create(self, test_session, test_project_and_doc):
+        """Test bulk inserting requirements with their history records."""
+        project, doc = test_project_and_doc
+
+        rows = [
+            {
+                'document_id': doc.id,
+                'project_id': project.id,
+                'label_number': f"test-Req#1-{i}",
+                'description': f"Requirement {i}",
+                'page_number': 1,
+                'priority': Priority.HIGH if i % 2 else Priority.LOW,
+                'confidence_score': 0.9,
+            }
+            for i in range(5)
+        ]
+
+        count = RequirementService.bulk_create(rows, session=test_session)
+        assert count == 5
+
+        reqs = RequirementService.get_requirements_by_document(doc.id, session=test_session)
+        assert sorted(r.label_number for r in reqs) == [f"test-Req#1-{i}" for i in range(5)]
+        assert all(r.version == 1 and r.is_current for r in reqs)
+
+        req = next(r for r in reqs if r.label_number == "test-Req#1-1")
+        assert req.priority == Priority.HIGH
+        history = RequirementService.get_requirement_history(req.id, session=test_session)
+        assert len(history) == 1
+        assert history[0].description == "Requirement 1"
+        assert history[0].snapshot_data['priority'] == "high"
+
+    def test_create_requirements_bulk_history(self, test_session, test_project_and_doc):
+        """Test ORM bulk creation writes one history record per requirement."""
+        from sqlalchemy import event
+
+        project, doc = test_project_and_doc
+        statements = []
+        engine = test_session.get_bind().engine
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            reqs = RequirementService.create_requirements_bulk([
+                {
+                    'document_id': doc.id,
+                    'project_id': project.id,
+                    'label_number': f"test-Req#1-{i}",
+                    'description': f"Requirement {i}",
+                    'page_number': i,
+                    'priority': Priority.MEDIUM,
+                }
+                for i in range(3)
+            ], session=test_session)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        assert len(reqs) == 3
+        # No per-row SELECT of the deferred detail columns for the snapshots
+        assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+        for req in reqs:
+            history = RequirementService.get_requirement_history(req.id, session=test_session)
+            assert len(history) == 1
+            assert history[0].version == 1
+            assert history[0].snapshot_data['page_number'] == req.page_number
+            assert history[0].snapshot_data['priority'] == "medium"
+
+    def test_bulk_create_replace_current(self, test_session, test_project_and_doc):
+        """Test re-processing a document supersedes its current requirements."""
+        project, doc = test_project_and_doc
+
+        rows = [
+            {
+                'document_id': doc.id,
+                'project_id': project.id,
+                'label_number': f"test-Req#1-{i}",
+                'description': f"Requirement {i}",
+                'page_number': 1,
+            }
+            for i in range(3)
+        ]
+
+        assert RequirementService.bulk_create(rows, session=test_session) == 3
+        assert RequirementService.bulk_create(rows, replace_current=True, session=test_session) == 3
+
+        current = RequirementService.get_requirements_by_document(doc.id, session=test_session)
+        everything = RequirementService.get_requirements_by_document(
+            doc.id, current_only=False, session=test_session)
+        assert len(current) == 3
+        assert len(everything) == 6
+
+    def test_get_confidence_histogram(self, test_session, test_project_and_doc):
+        """Test counting requirements per confidence decile."""
+        project, doc = test_project_and_doc
+
+        scores = [0.05, 0.55, 0.59, 0.6, 0.95, 1.0, None]
+        rows = [
+            {
+                'document_id': doc.id,
+                'project_id': project.id,
+                'label_number': f"test-Req#1-{i}",
+                'description': f"Requirement {i}",
+                'page_number': 1,
+                'confidence_score': score,
+            }
+            for i, score in enumerate(scores)
+        ]
+        RequirementService.bulk_create(rows, session=test_session)
+
+        histogram = RequirementService.get_confidence_histogram(project.id, session=test_session)
+        assert histogram == {0: 1, 5: 2, 6: 1, 9: 1, 10: 1}
+
+    def test_stream_requirements(self, test_session, test_project_and_doc):
+        """Test streaming requirements in chunks smaller than the result set."""
+        project, doc = test_project_and_doc
+
+        rows = [
+            {
+                'document_id': doc.id,
+                'project_id': project.id,
+                'label_number': f"test-Req#1-{i}",
+                'description': f"Requirement {i}",
+                'page_number': 1,
+            }
+            for i in range(5)
+        ]
+        RequirementService.bulk_create(rows, session=test_session)
+
+        streamed = RequirementService.stream_requirements(
+            project.id, chunk_size=2, session=test_session)
+        assert [r.label_number for r in streamed] == [f"test-Req#1-{i}" for i in range(5)]
+
+    def test_get_requirements_for_report(self, test_session, test_project_and_doc):
+        """Test report requirements come with their document and history preloaded."""
+        project, doc = test_project_and_doc
+
+        for i in range(3):
+            RequirementService.create_requirement(
+                document_id=doc.id,
+                project_id=project.id,
+                label_number=f"test-Req#1-{i}",
+                description=f"Requirement {i}",
+                page_number=1,
+                session=test_session
+            )
+        test_session.flush()
+        test_session.expunge_all()
+
+        reqs = RequirementService.get_requirements_for_report(project.id, session=test_session)
+        assert len(reqs) == 3
+
+        # Relationships are already loaded, so no lazy load is needed
+        for req in reqs:
+            assert req.document.filename == "test.pdf"
+            assert len(req.history) == 1
+
+    def test_get_requirement_lineage(self, test_session, test_project_and_doc):
+        """Test resolving a version chain from any of its members."""
+        from database.models import Requirement
+
+        project, doc = test_project_and_doc
+
+        parent_id = None
+        chain = []
+        for version in range(1, 4):
+            req = Requirement(
+                document_id=doc.id,
+                project_id=project.id,
+                label_number="test-Req#1-1",
+                description=f"Version {version}",
+                page_number=1,
+                version=version,
+                is_current=version == 3,
+                parent_requirement_id=parent_id
+            )
+            test_session.add(req)
+            test_session.flush()
+            parent_id = req.id
+            chain.append(req.id)
+
+        unrelated = RequirementService.create_requirement(
+            document_id=doc.id,
+            project_id=project.id,
+            label_number="test-Req#1-2",
+            description="Other",
+            page_number=1,
+            session=test_session
+        )
+
+        for member in chain:
+            lineage = RequirementService.get_requirement_lineage(member, session=test_session)
+            assert [r.id for r in lineage] == chain
+
+        assert [r.id for r in RequirementService.get_requirement_lineage(
+            unrelated.id, session=test_session)] == [unrelated.id]
+
+    def test_requirement_detail_columns_deferred(self, test_session, test_project_and_doc):
+        """Test raw_text and additional_data are only fetched when accessed."""
+        project, doc = test_project_and_doc
+        req = RequirementService.create_requirement(
+            document_id=doc.id,
+            project_id=project.id,
+            label_number="test-Req#1-1",
+            description="Requirement",
+            page_number=1,
+            raw_text="Raw requirement text",
+            additional_data={"source": "test"},
+            session=test_session
+        )
+        test_session.flush()
+        test_session.expunge_all()
+
+        req = RequirementService.get_requirement_by_id(req.id, session=test_session)
+        assert 'raw_text' not in req.__dict__
+        assert 'additional_data' not in req.__dict__
+
+        assert req.raw_text == "Raw requirement text"
+        # Loaded together as one group
+        assert req.__dict__['additional_data'] == {"source": "test"}
+
+    def test_requirement_parent_lazy_load_raises(self, test_session, test_project_and_doc):
+        """Test an implicit per-row load of a requirement's document is rejected."""
+        from sqlalchemy.exc import InvalidRequestError
+
+        project, doc = test_project_and_doc
+        req = RequirementService.create_requirement(
+            document_id=doc.id,
+            project_id=project.id,
+            label_number="test-Req#1-1",
+            description="Requirement",
+            page_number=1,
+            session=test_session
+        )
+        test_session.flush()
+        # Drop the document from the identity map so resolving it would need a query
+        test_session.expunge_all()
+
+        req = RequirementService.get_requirement_by_id(req.id, session=test_session)
+        with pytest.raises(InvalidRequestError):
+            _ = req.document
+
 
 class TestProcessingSessionService:
     """Test ProcessingSessionService methods."""
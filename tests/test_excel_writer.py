@@ -8,7 +8,7 @@ import tempfile  # <--- ADD THIS IMPORT
 
 # Assuming write_excel_file is in a file named excel_writer.py
 # Adjust this import path if your file is named differently or in a subfolder
-from excel_writer import write_excel_file
+from excel_writer import write_excel_file, write_excel_file_xlsxwriter, VALIDATION_EXTRA_ROWS
 
 
 @pytest.fixture
@@ -116,6 +116,12 @@ def test_write_excel_file_data_validations(empty_compliance_matrix_template):
     validations = writer.data_validations.dataValidation
     assert len(validations) >= 8  # Expecting 8 data validation rules as defined
 
+    # Validations are bounded to the data rows plus spare rows, not the full column
+    last_row = 4 + len(df) + VALIDATION_EXTRA_ROWS
+    for dv in validations:
+        assert str(dv.sqref).endswith(str(last_row))
+        assert '1048576' not in str(dv.sqref)
+
     book.close()
 
 
@@ -236,3 +242,105 @@ def test_write_excel_file_auto_filter(empty_compliance_matrix_template):
     assert '7' in writer.auto_filter.ref  # Should include row 7 (last data row)
 
     book.close()
+
+
+def test_write_excel_file_formula_uses_lookup_not_if_cascade(empty_compliance_matrix_template):
+    """
+    Tests that the compliance score formula scores each input with a single
+    MATCH lookup instead of a nested IF cascade, and references its own row.
+    """
+    excel_file = empty_compliance_matrix_template
+
+    data = {
+        'Page': [1, 2],
+        'Label Number': ['L001', 'L002'],
+        'Description': ['Req 1', 'Req 2'],
+        'Priority': ['high', 'low'],
+        'Confidence': [0.92, 0.68],
+        'Category': ['Functional', 'Safety']
+    }
+    df = pd.DataFrame(data, index=['REQ-A', 'REQ-B'])
+
+    write_excel_file(df, excel_file)
+
+    book = load_workbook(excel_file)
+    writer = book['MACHINE COMP. MATRIX']
+
+    formula = writer['Q6'].value
+    assert 'IF(' not in formula.replace('IFERROR(', '')
+    assert 'MATCH(I6, {"low","medium","high"}, 0)' in formula
+    assert 'MATCH(O6, {"yes","partially","no"}, 0)' in formula
+    assert 'MATCH(P6, {"easy","medium","hard"}, 0)' in formula
+    assert 'MATCH(N6, {"Approved","In discussion","Acquired"}, 0)' in formula
+
+    book.close()
+
+
+def test_write_excel_file_from_template_bytes(empty_compliance_matrix_template, tmp_path):
+    """
+    Tests that the workbook can be built from in-memory template bytes and saved
+    to a new path, leaving the template file itself untouched.
+    """
+    with open(empty_compliance_matrix_template, 'rb') as f:
+        template_bytes = f.read()
+    output_file = str(tmp_path / "output_matrix.xlsx")
+
+    data = {
+        'Page': [1], 'Label Number': ['L001'], 'Description': ['Desc'], 'Priority': ['high'], 'Confidence': [0.85], 'Category': ['Functional']  # noqa: E501
+    }
+    df = pd.DataFrame(data, index=['REQ-X'])
+
+    write_excel_file(df, output_file, template_bytes=template_bytes)
+
+    book = load_workbook(output_file)
+    writer = book['MACHINE COMP. MATRIX']
+    assert writer['A1'].value == "REQ_ID"
+    assert writer['A5'].value == 'REQ-X'
+    book.close()
+
+    template_book = load_workbook(empty_compliance_matrix_template)
+    assert template_book['MACHINE COMP. MATRIX']['A5'].value is None
+    template_book.close()
+
+
+def test_write_excel_file_xlsxwriter_engine(empty_compliance_matrix_template, tmp_path):
+    """
+    Tests that the optional xlsxwriter engine writes the same data, fills, formulas
+    and validations as the openpyxl engine, with the template header values copied.
+    """
+    pytest.importorskip('xlsxwriter')
+
+    with open(empty_compliance_matrix_template, 'rb') as f:
+        template_bytes = f.read()
+    output_file = str(tmp_path / "xlsxwriter_matrix.xlsx")
+
+    data = {
+        'Page': [1, 2, 3],
+        'Label Number': ['L001', 'L002', 'L003'],
+        'Description': ['=not a formula', 'Req 2', 'Req 3'],
+        'Priority': ['high', 'medium', 'low'],
+        'Confidence': [0.95, 0.72, 0.55],
+        'Category': ['Functional', 'Safety', 'Performance']
+    }
+    df = pd.DataFrame(data, index=['REQ-A', 'REQ-B', 'REQ-C'])
+
+    write_excel_file_xlsxwriter(df, output_file, template_bytes=template_bytes)
+
+    book = load_workbook(output_file)
+    writer = book['MACHINE COMP. MATRIX']
+
+    assert writer['A1'].value == "REQ_ID"
+    assert writer['A5'].value == 'REQ-A'
+    assert writer['B6'].value == 2
+    assert writer['D5'].value == '=not a formula'
+    assert writer['I7'].value == 'low'
+    assert writer['I5'].fill.start_color.rgb.endswith('FF0000')
+    assert writer['E5'].value == 0.95
+    assert writer['E5'].number_format == '0.00'
+    assert writer['E7'].fill.start_color.rgb.endswith('FF0000')
+    assert writer['Q6'].value.startswith('=ROUND(((')
+    assert 'MATCH(I6, {"low","medium","high"}, 0)' in writer['Q6'].value
+    assert len(writer.data_validations.dataValidation) >= 8
+    assert writer.auto_filter.ref == 'A4:Q7'
+
+    book.close()
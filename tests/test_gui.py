@@ -17,6 +17,9 @@ from PySide6.QtCore import QMimeData, QUrl
 from PySide6.QtGui import QDragEnterEvent, QDropEvent
 import tempfile
 
+# Every test here builds the main window; collect Qt objects after each one
+pytestmark = pytest.mark.qt_heavy
+
 
 @pytest.fixture(scope="module")
 def app():
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for ProcessingWorker
+
+Tests the process-pool branch of ProcessingWorker.run:
+- Results recorded in input order, whatever order workers finish in
+- Per-file persistence and error reporting
+- Cancellation in the middle of a batch
+
+The pool is replaced by an inline executor so the tests run without
+spawning processes; everything else is the real worker code.
+
+Requires: PySide6, pytest
+"""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+processing_worker = pytest.importorskip("processing_worker")
+
+
+class _InlineExecutor:
+    """Stands in for ProcessPoolExecutor: runs each submitted call immediately."""
+
+    instances = []
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.mp_context = mp_context
+        _InlineExecutor.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def _reverse_completion(futures):
+    """as_completed replacement: the last submitted file finishes first."""
+    return reversed(list(futures))
+
+
+@pytest.fixture
+def worker_env(tmp_path, monkeypatch):
+    """Patch the worker's collaborators and return the recorded calls."""
+    folder_in = tmp_path / "in"
+    folder_in.mkdir()
+    pdfs = []
+    for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf"):
+        pdf = folder_in / name
+        pdf.write_bytes(b"%PDF-1.4 " + name.encode())
+        pdfs.append(str(pdf))
+
+    env = SimpleNamespace(
+        folder_in=str(folder_in),
+        folder_out=tmp_path / "out",
+        pdfs=pdfs,
+        failing=set(),
+        persisted=[],
+        project=SimpleNamespace(id=1, name="in"),
+    )
+
+    def fake_run_one(file_path, cm_file, keywords, folder_output, confidence_threshold):
+        if file_path in env.failing:
+            return None, 0.1, "corrupt PDF"
+        return pd.DataFrame({'Label Number': ['x-Req#1-1'], 'Confidence': [0.9]}), 0.1, None
+
+    def fake_persist(df, project, file_path, document=None):
+        env.persisted.append((file_path, document))
+
+    _InlineExecutor.instances.clear()
+    monkeypatch.setattr(processing_worker, "ProcessPoolExecutor", _InlineExecutor)
+    monkeypatch.setattr(processing_worker, "as_completed", _reverse_completion)
+    monkeypatch.setattr(processing_worker, "_run_one", fake_run_one)
+    monkeypatch.setattr(processing_worker, "get_all", lambda folder, ext: list(pdfs))
+    monkeypatch.setattr(processing_worker, "persist_requirements", fake_persist)
+    monkeypatch.setattr(processing_worker, "sync_documents",
+                        lambda project, paths: {path: f"doc:{path}" for path in paths})
+    monkeypatch.setattr(processing_worker, "DATABASE_AVAILABLE", True)
+    monkeypatch.setattr(processing_worker, "ProjectService",
+                        SimpleNamespace(get_or_create_project=lambda **kwargs: env.project))
+    monkeypatch.setattr(processing_worker, "ProcessingSessionService",
+                        SimpleNamespace(create_session=lambda **kwargs: None))
+    return env
+
+
+def _make_worker(env):
+    worker = processing_worker.ProcessingWorker(
+        env.folder_in, str(env.folder_out), "template.xlsx", 0.5, keywords={"shall"})
+    messages = []
+    worker.log_message.connect(lambda message, level: messages.append((level, message)))
+    return worker, messages
+
+
+def _logged_files(env):
+    log = (env.folder_out / "LOG.txt").read_text(encoding="utf-8")
+    return [line.split(": ", 1)[1] for line in log.splitlines() if line.startswith("PDF Name: ")]
+
+
+class TestProcessingWorkerPool:
+    """Test the process-pool branch of ProcessingWorker.run."""
+
+    def test_results_recorded_in_input_order(self, worker_env):
+        """Test LOG.txt and persistence follow input order although files finish in reverse."""
+        worker, messages = _make_worker(worker_env)
+        worker.run()
+
+        assert _logged_files(worker_env) == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+        assert [path for path, _ in worker_env.persisted] == worker_env.pdfs
+        assert ("info", "[1/4] Completed a.pdf. Found 1 requirements.") in messages
+        assert _InlineExecutor.instances[0].mp_context.get_start_method() == "spawn"
+
+    def test_per_file_results_and_errors(self, worker_env):
+        """Test successful files are persisted with their synced document and failures reported."""
+        worker_env.failing.add(worker_env.pdfs[1])
+        worker, messages = _make_worker(worker_env)
+        worker.run()
+
+        assert _logged_files(worker_env) == ["a.pdf", "c.pdf", "d.pdf"]
+        assert worker_env.persisted == [
+            (path, f"doc:{path}") for path in worker_env.pdfs if path != worker_env.pdfs[1]
+        ]
+        assert ("error", "Error processing b.pdf: corrupt PDF") in messages
+        log = (worker_env.folder_out / "LOG.txt").read_text(encoding="utf-8")
+        assert "Total Requirements: 3" in log
+
+    def test_cancel_mid_batch(self, worker_env):
+        """Test stopping after the first finished file records only what has finished."""
+        worker, messages = _make_worker(worker_env)
+        worker.progress_updated.connect(lambda value: value and worker.stop())
+        worker.run()
+
+        assert ("warning", "Processing cancelled.") in messages
+        # d.pdf finished first; it is still recorded although a-c never completed
+        assert _logged_files(worker_env) == ["d.pdf"]
+        assert worker_env.persisted == [(worker_env.pdfs[3], f"doc:{worker_env.pdfs[3]}")]
@@ -13,6 +13,7 @@ import os
 import pandas as pd
 from unittest.mock import patch
 from pathlib import Path
+from types import SimpleNamespace
 
 from security.path_validator import PathValidationError
 
@@ -27,7 +28,7 @@ class TestRequirementBotSecurity:
              patch('RB_coordinator.write_excel_file') as mock_excel, \
              patch('RB_coordinator.export_to_basil') as mock_basil, \
              patch('RB_coordinator.highlight_requirements') as mock_highlight, \
-             patch('RB_coordinator.shutil.copy2') as mock_copy:
+             patch('RB_coordinator.load_cm_template') as mock_template:
 
             # Setup mock return values
             mock_df = pd.DataFrame({
@@ -48,7 +49,7 @@ class TestRequirementBotSecurity:
                 'excel': mock_excel,
                 'basil': mock_basil,
                 'highlight': mock_highlight,
-                'copy': mock_copy,
+                'template': mock_template,
                 'df': mock_df
             }
 
@@ -236,7 +237,7 @@ class TestRequirementBotOutputValidation:
              patch('RB_coordinator.write_excel_file') as mock_excel, \
              patch('RB_coordinator.export_to_basil') as mock_basil, \
              patch('RB_coordinator.highlight_requirements') as mock_highlight, \
-             patch('RB_coordinator.shutil.copy2') as mock_copy:
+             patch('RB_coordinator.load_cm_template') as mock_template:
 
             mock_df = pd.DataFrame({
                 'Label Number': ['test-Req#1-1'],
@@ -256,7 +257,7 @@ class TestRequirementBotOutputValidation:
                 'excel': mock_excel,
                 'basil': mock_basil,
                 'highlight': mock_highlight,
-                'copy': mock_copy
+                'template': mock_template
             }
 
     @pytest.fixture
@@ -347,7 +348,7 @@ class TestRequirementBotErrorHandling:
              patch('RB_coordinator.write_excel_file') as mock_excel, \
              patch('RB_coordinator.export_to_basil') as mock_basil, \
              patch('RB_coordinator.highlight_requirements') as mock_highlight, \
-             patch('RB_coordinator.shutil.copy2') as mock_copy:
+             patch('RB_coordinator.load_cm_template') as mock_template:
 
             mock_df = pd.DataFrame({
                 'Label Number': ['test-Req#1-1'],
@@ -388,7 +389,7 @@ class TestRequirementBotErrorHandling:
              patch('RB_coordinator.write_excel_file') as mock_excel, \
              patch('RB_coordinator.export_to_basil') as mock_basil, \
              patch('RB_coordinator.highlight_requirements') as mock_highlight, \
-             patch('RB_coordinator.shutil.copy2') as mock_copy:
+             patch('RB_coordinator.load_cm_template') as mock_template:
 
             mock_df = pd.DataFrame({
                 'Label Number': ['test-Req#1-1'],
@@ -424,6 +425,40 @@ class TestRequirementBotErrorHandling:
             assert mock_excel.called
             assert mock_basil.called
 
+    def test_excel_failure_raised_after_other_outputs_complete(self, valid_paths):
+        """Test that a compliance matrix failure is raised while BASIL/PDF outputs still run."""
+        with patch('RB_coordinator.requirement_finder') as mock_finder, \
+             patch('RB_coordinator.write_excel_file') as mock_excel, \
+             patch('RB_coordinator.export_to_basil') as mock_basil, \
+             patch('RB_coordinator.highlight_requirements') as mock_highlight, \
+             patch('RB_coordinator.load_cm_template'):
+
+            mock_finder.return_value = pd.DataFrame({
+                'Label Number': ['test-Req#1-1'],
+                'Description': ['Test requirement'],
+                'Page': [1],
+                'Keyword': ['shall'],
+                'Raw': [['Test', 'requirement']],
+                'Confidence': [0.9],
+                'Priority': ['high'],
+                'Note': ['test-Req#1-1:Test requirement']
+            })
+            mock_basil.return_value = True
+            mock_excel.side_effect = Exception("Excel write failed")
+
+            from RB_coordinator import requirement_bot
+
+            with pytest.raises(Exception, match="Excel write failed"):
+                requirement_bot(
+                    path_in=valid_paths['input'],
+                    cm_path=valid_paths['cm'],
+                    words_to_find={'shall'},
+                    path_out=valid_paths['output']
+                )
+
+            assert mock_basil.called
+            assert mock_highlight.called
+
 
 class TestPathSanitizationInLogging:
     """Test suite for path sanitization in logging."""
@@ -452,7 +487,7 @@ class TestPathSanitizationInLogging:
              patch('RB_coordinator.write_excel_file'), \
              patch('RB_coordinator.export_to_basil'), \
              patch('RB_coordinator.highlight_requirements'), \
-             patch('RB_coordinator.shutil.copy2'):
+             patch('RB_coordinator.load_cm_template'):
 
             mock_df = pd.DataFrame({
                 'Label Number': ['test-Req#1-1'],
@@ -482,3 +517,98 @@ class TestPathSanitizationInLogging:
             log_text = caplog.text
             # Should contain filenames
             assert "test.pdf" in log_text or "..." in log_text
+
+
+class TestComplianceMatrixTemplateCache:
+    """Test suite for the in-memory compliance matrix template cache."""
+
+    def test_template_read_once_and_refreshed_on_change(self, tmp_path):
+        """Test that the template is cached and re-read when the file changes."""
+        from RB_coordinator import load_cm_template
+
+        cm_template = tmp_path / "Compliance_Matrix_Template_rev001.xlsx"
+        cm_template.write_bytes(b"first version")
+
+        first = load_cm_template(str(cm_template))
+        assert first == b"first version"
+        assert load_cm_template(str(cm_template)) is first
+
+        cm_template.write_bytes(b"second, longer version")
+        assert load_cm_template(str(cm_template)) == b"second, longer version"
+
+
+class TestPersistRequirements:
+    """Test suite for saving requirements extracted in a pool worker process."""
+
+    def test_requirements_saved_for_validated_pdf(self, tmp_path):
+        """Test that the document is resolved and the requirements saved."""
+        import RB_coordinator
+        from RB_coordinator import persist_requirements
+
+        if not RB_coordinator.DATABASE_AVAILABLE:
+            pytest.skip("Database services not available")
+
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_text("%PDF-1.4\n%test")
+        df = pd.DataFrame({'Label Number': ['test-Req#1-1'], 'Page': [1]})
+        project = object()
+
+        with patch('RB_coordinator._get_or_create_document', return_value='document') as mock_doc, \
+             patch('RB_coordinator._save_requirements') as mock_save:
+            persist_requirements(df, project, str(pdf_file))
+
+        assert mock_doc.call_args[0][0] is project
+        mock_save.assert_called_once_with(df, project=project, document='document')
+
+    def test_synced_document_reused(self, tmp_path):
+        """Test that a document resolved by sync_documents skips the per-file lookup."""
+        import RB_coordinator
+        from RB_coordinator import persist_requirements
+
+        if not RB_coordinator.DATABASE_AVAILABLE:
+            pytest.skip("Database services not available")
+
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_text("%PDF-1.4\n%test")
+        df = pd.DataFrame({'Label Number': ['test-Req#1-1'], 'Page': [1]})
+        project = object()
+
+        with patch('RB_coordinator._get_or_create_document') as mock_doc, \
+             patch('RB_coordinator._save_requirements') as mock_save:
+            persist_requirements(df, project, str(pdf_file), document='document')
+
+        mock_doc.assert_not_called()
+        mock_save.assert_called_once_with(df, project=project, document='document')
+
+    def test_same_named_pdfs_in_subfolders_stay_separate(self, tmp_path):
+        """Test that documents are keyed by their path relative to the input folder."""
+        import RB_coordinator
+        from RB_coordinator import sync_documents
+
+        if not RB_coordinator.DATABASE_AVAILABLE:
+            pytest.skip("Database services not available")
+
+        paths = []
+        for folder in ("", "rev_a", "rev_b"):
+            (tmp_path / folder).mkdir(exist_ok=True)
+            pdf_file = tmp_path / folder / "spec.pdf"
+            pdf_file.write_text(f"%PDF-1.4\n%{folder}")
+            paths.append(str(pdf_file))
+        project = SimpleNamespace(id=1, input_folder_path=str(tmp_path))
+
+        def fake_sync_folder(project_id, files):
+            return {name: (f"doc:{name}", True) for name, _ in files}
+
+        with patch('RB_coordinator.DocumentService.sync_folder', side_effect=fake_sync_folder):
+            documents = sync_documents(project, paths)
+
+        assert [documents[path] for path in paths] == ["doc:spec.pdf", "doc:rev_a/spec.pdf", "doc:rev_b/spec.pdf"]
+
+    def test_invalid_pdf_path_not_saved(self, tmp_path):
+        """Test that nothing is saved when the PDF path fails validation."""
+        from RB_coordinator import persist_requirements
+
+        with patch('RB_coordinator._save_requirements') as mock_save:
+            persist_requirements(pd.DataFrame(), object(), str(tmp_path / "missing.pdf"))
+
+        mock_save.assert_not_called()
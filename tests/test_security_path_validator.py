@@ -21,7 +21,8 @@ from security.path_validator import (
     validate_excel_template,
     validate_directory,
     sanitize_path_for_logging,
-    validate_batch_paths
+    validate_batch_paths,
+    clear_validation_cache
 )
 
 
@@ -315,6 +316,31 @@ class TestConvenienceFunctions:
 
         assert "expected a directory" in str(excinfo.value).lower()
 
+    def test_validate_excel_template_cached_until_file_removed(self, tmp_path):
+        """Test that a cached template validation does not outlive the file."""
+        clear_validation_cache()
+        xlsx_file = tmp_path / "template.xlsx"
+        xlsx_file.write_text("test")
+
+        first = validate_excel_template(str(xlsx_file))
+        assert validate_excel_template(str(xlsx_file)) is first
+
+        xlsx_file.unlink()
+        with pytest.raises(PathValidationError):
+            validate_excel_template(str(xlsx_file))
+
+    def test_validate_directory_cache_respects_options(self, tmp_path):
+        """Test that cached directory results are keyed by the validation options."""
+        clear_validation_cache()
+        test_dir = tmp_path / "test_dir"
+        test_dir.mkdir()
+
+        plain = validate_directory(str(test_dir))
+        writable = validate_directory(str(test_dir), check_writable=True)
+
+        assert plain == writable == test_dir
+        assert validate_directory(str(test_dir)) is plain
+
 
 class TestBatchValidation:
     """Test suite for batch path validation."""